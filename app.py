@@ -1,16 +1,38 @@
 import os
+import io
+import gzip
+import json
+import base64
+import binascii
+import time
 import logging
-from flask import Flask, render_template, request, jsonify, send_file, make_response
-from utils.scraper import extract_article_content
-from utils.summarizer import summarize_text, calculate_reading_time
-from utils.translator import translate_text
-from utils.pdf_generator import generate_pdf
-from utils.pdf_extractor import extract_text_from_pdf
+from flask import Flask, Request, render_template, request, jsonify, send_file, make_response, url_for, Response, stream_with_context, g
+from utils.pdf_generator import generate_pdf, pdf_etag
+from utils.pdf_extractor import MAX_PAGES as PDF_MAX_PAGES, SpooledUpload, parse_page_range
+from utils.cache import ResultCache, SQLCacheStore, SingleFlight, normalize_url, hash_bytes, make_cache_key, make_result_id
+from utils.translator import translate_text, LANGUAGE_CODES, translation_memory, translation_flights
+from utils.pipeline import run_pipeline, PipelineError, StageTimer, STAGES
+from utils.digest import fetch_pages, merge_summaries, DIGEST_MAX_URLS
+from utils.admission import Overloaded, admission_stats
+from utils.summarizer import calculate_reading_time, sentences_for_full_summary, DEFAULT_SCORING_METHOD
+from utils.jobs import JobManager, JobQueueFull, JobStateError
+from utils.metrics import REGISTRY
+from utils.warmup import readiness
+from werkzeug.utils import secure_filename
 import urllib.parse
 import tempfile
 
+class UploadRequest(Request):
+    """Request that spools PDF uploads into hashing temporary files as the body is parsed"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and allowed_file(filename):
+            return SpooledUpload(app.config['UPLOAD_FOLDER'])
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
 # Create the Flask app
 app = Flask(__name__)
+app.request_class = UploadRequest
 app.secret_key = os.environ.get("SESSION_SECRET", "dev_secret_key")
 
 # Configure logging
@@ -22,95 +44,767 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload size
 app.config['UPLOAD_FOLDER'] = tempfile.gettempdir()
 app.config['ALLOWED_EXTENSIONS'] = {'pdf'}
 
+# Early-stopped PDF extraction keeps this many times the sentences a full-length summary needs
+app.config['PDF_EARLY_STOP_FACTOR'] = float(os.environ.get('PDF_EARLY_STOP_FACTOR', 2))
+
+# Configure the result cache (set RESULT_CACHE_URL, e.g. sqlite:///result_cache.db, for a persistent tier)
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get('RESULT_CACHE_TTL', 3600))
+app.config['RESULT_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 1024))
+app.config['RESULT_CACHE_MAX_BYTES'] = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+app.config['RESULT_CACHE_URL'] = os.environ.get('RESULT_CACHE_URL')
+
+# Configure the result store that lets downloads refer to a result by id
+app.config['RESULT_STORE_TTL'] = int(os.environ.get('RESULT_STORE_TTL', 24 * 3600))
+app.config['RESULT_STORE_MAX_ENTRIES'] = int(os.environ.get('RESULT_STORE_MAX_ENTRIES', 4096))
+
+# Configure how long URL results are kept for revalidation after they leave the result cache
+app.config['REVALIDATION_TTL'] = int(os.environ.get('REVALIDATION_TTL', 7 * 24 * 3600))
+app.config['REVALIDATION_MAX_ENTRIES'] = int(os.environ.get('REVALIDATION_MAX_ENTRIES', 4096))
+
+# Configure background jobs
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 4))
+app.config['JOB_MAX_PENDING'] = int(os.environ.get('JOB_MAX_PENDING', 100))
+app.config['JOB_TTL'] = int(os.environ.get('JOB_TTL', 3600))
+
+# Summary parameters used by /process (part of every cache key)
+SUMMARY_OPTIONS = {'summary_percentage': 0.3, 'min_sentences': 3, 'max_sentences': 10, 'method': DEFAULT_SCORING_METHOD}
+
+# Fields the JSON API can return; article_content is only sent when asked for
+API_FIELDS = ('result_id', 'source_type', 'source_name', 'original_url', 'article_content', 'summary',
+              'reading_time', 'translations', 'images', 'timings_ms')
+API_DEFAULT_FIELDS = tuple(field for field in API_FIELDS if field != 'article_content')
+
+# JSON API responses smaller than this are not worth compressing
+API_COMPRESS_MIN_BYTES = 1024
+
+result_cache = ResultCache(
+    ttl=app.config['RESULT_CACHE_TTL'],
+    max_entries=app.config['RESULT_CACHE_MAX_ENTRIES'],
+    max_bytes=app.config['RESULT_CACHE_MAX_BYTES'],
+    database_url=app.config['RESULT_CACHE_URL']
+)
+
+result_store = ResultCache(
+    ttl=app.config['RESULT_STORE_TTL'],
+    max_entries=app.config['RESULT_STORE_MAX_ENTRIES'],
+    database_url=app.config['RESULT_CACHE_URL'],
+    table_name='result_store'
+)
+
+# Last result per URL cache key; served again when the page turns out unchanged on refetch
+revalidation_store = ResultCache(
+    ttl=app.config['REVALIDATION_TTL'],
+    max_entries=app.config['REVALIDATION_MAX_ENTRIES'],
+    database_url=app.config['RESULT_CACHE_URL'],
+    table_name='revalidation_store'
+)
+
+def open_shared_store(table_name, description):
+    """Open a table shared between workers, or return None without a shared database"""
+    if not app.config['RESULT_CACHE_URL']:
+        return None
+    try:
+        return SQLCacheStore(app.config['RESULT_CACHE_URL'], table_name)
+    except Exception as e:
+        logger.warning(f"{description} disabled: {str(e)}")
+        return None
+
+# /process work currently running, by result cache key, claimed across workers
+process_flights = SingleFlight(store=open_shared_store('process_flights', 'Coalescing across workers'), lookup=result_cache.get)
+
+job_manager = JobManager(
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_MAX_PENDING'],
+    ttl=app.config['JOB_TTL'],
+    store=open_shared_store('job_store', 'Shared job state')
+)
+
+# Request and cache metrics (pipeline stage metrics are recorded by StageTimer)
+REQUEST_LATENCY = REGISTRY.histogram('http_request_duration_seconds', 'Time spent handling requests', ['endpoint'])
+REQUESTS_TOTAL = REGISTRY.counter('http_requests_total', 'Requests handled', ['endpoint', 'status'])
+REQUESTS_IN_FLIGHT = REGISTRY.gauge('http_requests_in_flight', 'Requests currently being handled', ['endpoint'])
+CACHE_HITS = REGISTRY.counter('cache_hits_total', 'Cache lookups that found an entry', ['cache'])
+CACHE_MISSES = REGISTRY.counter('cache_misses_total', 'Cache lookups that found nothing', ['cache'])
+CACHE_HIT_RATIO = REGISTRY.gauge('cache_hit_ratio', 'Share of cache lookups that found an entry', ['cache'])
+CACHE_ENTRIES = REGISTRY.gauge('cache_entries', 'Entries held in the in-memory cache tier', ['cache'])
+JOBS = REGISTRY.gauge('jobs', 'Background jobs by status', ['status'])
+COALESCED_CALLS = REGISTRY.counter('coalesced_calls_total', 'Calls that shared the result of an identical call in flight', ['flight'])
+
+def collect_component_metrics():
+    """Copy cache, job and coalescing counters into the metrics registry"""
+    caches = (
+        ('result', result_cache),
+        ('result_store', result_store),
+        ('revalidation', revalidation_store),
+        ('translation_memory', translation_memory),
+    )
+    for name, cache in caches:
+        stats = cache.stats()
+        CACHE_HITS.set(stats['hits'], cache=name)
+        CACHE_MISSES.set(stats['misses'], cache=name)
+        CACHE_HIT_RATIO.set(stats['hit_rate'], cache=name)
+        CACHE_ENTRIES.set(stats['entries'], cache=name)
+    for status, count in job_manager.counts().items():
+        JOBS.set(count, status=status)
+    for name, flights in (('process', process_flights), ('translate', translation_flights)):
+        COALESCED_CALLS.set(flights.stats()['shared'], flight=name)
+
+REGISTRY.add_collector(collect_component_metrics)
+
+@app.before_request
+def start_request_timer():
+    """Start timing the request and its pipeline stages"""
+    g.timer = StageTimer()
+    g.request_start = time.perf_counter()
+    g.endpoint = request.endpoint or 'unknown'
+    REQUESTS_IN_FLIGHT.inc(endpoint=g.endpoint)
+
+@app.after_request
+def add_server_timing(response):
+    """Report stage timings in a Server-Timing header and record request metrics"""
+    duration = time.perf_counter() - g.request_start
+    server_timing = g.timer.server_timing()
+    response.headers['Server-Timing'] = f"{server_timing + ', ' if server_timing else ''}total;dur={duration * 1000:.1f}"
+    REQUEST_LATENCY.observe(duration, endpoint=g.endpoint)
+    REQUESTS_TOTAL.inc(endpoint=g.endpoint, status=str(response.status_code))
+    return response
+
+@app.teardown_request
+def finish_request(exc):
+    """Count the request as finished, even if it raised"""
+    if 'endpoint' in g:
+        REQUESTS_IN_FLIGHT.dec(endpoint=g.endpoint)
+
+def overloaded_response(e):
+    """
+    Turn away a request that a saturated stage rejected
+    
+    Args:
+        e (Overloaded): The rejection
+        
+    Returns:
+        tuple: A 503 response with a Retry-After header, and its status
+    """
+    response = jsonify({'error': str(e)})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
 def allowed_file(filename):
     """Check if the uploaded file has an allowed extension"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
+def parse_pdf_options():
+    """
+    Read the optional page range and early-stop flag submitted with a PDF
+    
+    'pages' selects pages like "3", "2-10" or "5-"; 'early_stop' ends extraction
+    once the summary would not get any longer (with some text to spare).
+    
+    Returns:
+        dict: Keyword arguments for extract_text_from_pdf (empty for the defaults)
+        
+    Raises:
+        PipelineError: If the page range is invalid
+    """
+    options = {}
+    pages = request.form.get('pages', '').strip()
+    if pages:
+        try:
+            options['page_range'] = parse_page_range(pages)
+        except ValueError as e:
+            raise PipelineError(str(e))
+    if request.form.get('early_stop', '').lower() in ('1', 'true', 'on', 'yes'):
+        options['stop_after_sentences'] = int(sentences_for_full_summary(**SUMMARY_OPTIONS) * app.config['PDF_EARLY_STOP_FACTOR'])
+    return options
+
+def parse_process_request():
+    """
+    Read and validate the URL or PDF submitted to /process
+    
+    Returns:
+        tuple: (source_type, source, cache_key, target_language, extract_options)
+        
+    Raises:
+        PipelineError: If the submission is invalid
+    """
+    target_language = request.form.get('language', 'en')
+    
+    # Check if it's a URL or PDF file upload
+    url = request.form.get('url')
+    pdf_file = request.files.get('pdf_file')
+    
+    if url and url.strip():
+        # Validate URL
+        parsed_url = urllib.parse.urlparse(url)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise PipelineError('Invalid URL format')
+        
+        cache_key = make_cache_key(normalize_url(url), target_language, **SUMMARY_OPTIONS)
+        return 'url', url, cache_key, target_language, {}
+    
+    elif pdf_file and pdf_file.filename:
+        # Validate file extension
+        if not allowed_file(pdf_file.filename):
+            raise PipelineError('Only PDF files are allowed')
+        
+        extract_options = parse_pdf_options()
+        
+        # Werkzeug already spooled and hashed the upload (see UploadRequest). Take the file
+        # over from the request, which would close and remove it when it ends; a background
+        # job may still be reading it then, and it is removed once the last reference is gone
+        source = pdf_file.stream
+        pdf_file.stream = io.BytesIO()
+        source.filename = pdf_file.filename
+        content_hash = source.hexdigest()
+        
+        # The same document with other pages or early stopping is a different result
+        cache_key = make_cache_key('pdf:' + content_hash, target_language, **SUMMARY_OPTIONS, **extract_options)
+        return 'pdf', source, cache_key, target_language, extract_options
+    
+    # Neither URL nor PDF file provided
+    raise PipelineError('Please provide a URL or upload a PDF file')
+
+def build_result(source_type, source, cache_key, target_language, timer=None, extract_options=None):
+    """Run the pipeline for a source that is not in the result cache, and cache its result"""
+    # An expired URL result is revalidated against the page instead of being rebuilt from scratch
+    previous = revalidation_store.get(cache_key) if source_type == 'url' else None
+    result = run_pipeline(source_type, source, target_language, SUMMARY_OPTIONS, timer, previous, extract_options=extract_options)
+    
+    # Cache the result, unless the translation failed and should be retried next time
+    if not result['translated_summary'].startswith('Translation error:'):
+        result_cache.set(cache_key, result)
+        if source_type == 'url':
+            revalidation_store.set(cache_key, result)
+    return result
+
+def store_result(result, fresh):
+    """
+    Give a result its id and keep it in the result store
+    
+    Args:
+        result (dict): The result; its 'result_id' is set
+        fresh (bool): Whether the result was just computed; otherwise it is only
+            written if its id is not stored yet, which keeps cache hits read-only
+    """
+    result['result_id'] = make_result_id(result)
+    if fresh or not result_store.contains(result['result_id']):
+        result_store.set(result['result_id'], result)
+
+def process_source(source_type, source, cache_key, target_language, timer=None, extract_options=None):
+    """
+    Serve a cached result for the source, or run the pipeline and cache its result
+    
+    Concurrent requests for the same cache key share one pipeline run: while it
+    is in flight, the others wait for its result instead of starting their own.
+    With a shared database this holds across workers too; without one, each
+    worker process runs the pipeline at most once per key at a time.
+    
+    Args:
+        source_type (str): 'url', 'pdf' or 'text'
+        source: The URL, a file-like PDF object with a filename, or the text itself
+        cache_key (str): Result cache key for the source, language and summary parameters
+        target_language (str): Target language code
+        timer (StageTimer): Records stage timings (optional)
+        extract_options (dict): PDF page range and early stop, as part of cache_key (optional)
+        
+    Returns:
+        dict: The processed result
+    """
+    cached_result = result_cache.get(cache_key)
+    fresh = False
+    if cached_result:
+        logger.debug(f"Result cache hit for {source_type}: {cache_key}")
+        if source_type == 'pdf':
+            cached_result['source_name'] = secure_filename(source.filename)
+        result = cached_result
+    
+    else:
+        result, shared = process_flights.do(
+            cache_key, build_result, source_type, source, cache_key, target_language, timer, extract_options
+        )
+        if shared:
+            logger.debug(f"Shared an in-flight result for {source_type}: {cache_key}")
+            # Every waiting request received the same dict; give this one its own
+            result = dict(result)
+            if source_type == 'pdf':
+                result['source_name'] = secure_filename(source.filename)
+        fresh = not shared
+    
+    # Keep the result server-side so downloads only need to send its id
+    store_result(result, fresh)
+    
+    return result
+
 @app.route('/')
 def index():
     """Render the main page"""
-    return render_template('index.html')
+    return render_template('index.html', pdf_max_pages=PDF_MAX_PAGES)
+
+def render_result(result):
+    """
+    Render the result page of a processed source
+    
+    The PDF download links to the stored result only when results are kept in the
+    shared database; otherwise the page posts the summary back, since another
+    worker cannot see this process's result store.
+    """
+    return render_template('result.html', result=result, stored_download=result_store.store is not None)
 
 @app.route('/process', methods=['POST'])
 def process():
     """Process the URL or PDF, extract content, summarize, and translate"""
     try:
-        target_language = request.form.get('language', 'en')
-        article_content = None
-        images = []
-        source_type = None
-        source_name = None
-        
-        # Check if it's a URL or PDF file upload
-        url = request.form.get('url')
+        source_type, source, cache_key, target_language, extract_options = parse_process_request()
+        result = process_source(source_type, source, cache_key, target_language, g.timer, extract_options)
+        with g.timer.stage('render'):
+            return render_result(result)
+    
+    except PipelineError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except Overloaded as e:
+        return overloaded_response(e)
+    
+    except Exception as e:
+        logger.error(f"Error processing request: {str(e)}")
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+def run_process_job(progress, source_type, source, cache_key, target_language, extract_options):
+    """Run /process work inside a background job, reporting each stage"""
+    return process_source(source_type, source, cache_key, target_language, StageTimer(progress), extract_options)
+
+def job_status_payload(job):
+    """Build the public status of a job"""
+    payload = {
+        'job_id': job['id'],
+        'status': job['status'],
+        'stages': [
+            dict(name=name, **job['stages'].get(name, {'status': 'pending', 'duration_ms': None}))
+            for name in STAGES
+        ],
+        'error': job['error'],
+    }
+    if job['status'] == 'done':
+        payload['result_url'] = url_for('job_result', job_id=job['id'])
+    return payload
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue the URL or PDF for processing in the background and return a job id"""
+    try:
+        source_type, source, cache_key, target_language, extract_options = parse_process_request()
+        job_id = job_manager.submit(run_process_job, source_type, source, cache_key, target_language, extract_options)
+    
+    except PipelineError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    except (JobQueueFull, JobStateError) as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id),
+        'events_url': url_for('job_events', job_id=job_id),
+    }), 202
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the status and stage timings of a background job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    return jsonify(job_status_payload(job))
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream job status updates as server-sent events until the job finishes"""
+    if not job_manager.get(job_id):
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    
+    def stream():
+        version = -1
+        while True:
+            job = job_manager.wait_for_change(job_id, version)
+            if not job:
+                return
+            if job['version'] != version:
+                version = job['version']
+                yield f"data: {json.dumps(job_status_payload(job))}\n\n"
+            else:
+                # Keep the connection alive through proxies while nothing changes
+                yield ": keep-alive\n\n"
+            if job['status'] in ('done', 'failed'):
+                return
+    
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Render the result page of a finished background job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Unknown or expired job'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'error': f"An error occurred: {job['error']}"}), 500
+    if job['status'] != 'done':
+        return jsonify({'error': 'The job has not finished yet'}), 409
+    return render_result(job['result'])
+
+def parse_api_request():
+    """
+    Read and validate a /api/v1/summarize request
+    
+    The source is a JSON body with 'url', 'text' or base64 'pdf' (plus an optional
+    'filename'), a multipart form with 'url', 'text' or a 'pdf_file' upload, or a raw
+    application/pdf body. 'language' (a code or a list of codes) and 'fields' (a list
+    or comma-separated string) may be given in the body or the query string.
+    
+    Returns:
+        tuple: (source_type, source, source_key, target_languages, fields)
+        
+    Raises:
+        PipelineError: If the request is invalid
+    """
+    if request.mimetype == 'application/pdf':
+        params = {}
+        pdf_bytes = request.get_data()
+        filename = request.args.get('filename', 'document.pdf')
+    elif request.is_json:
+        params = request.get_json(silent=True)
+        if not isinstance(params, dict):
+            raise PipelineError('The request body must be a JSON object')
+        pdf_bytes = None
+        if params.get('pdf'):
+            try:
+                pdf_bytes = base64.b64decode(params['pdf'], validate=True)
+            except (binascii.Error, TypeError):
+                raise PipelineError("'pdf' must be base64-encoded")
+        filename = params.get('filename') or 'document.pdf'
+        if not isinstance(filename, str):
+            raise PipelineError("'filename' must be a string")
+    else:
+        params = request.form.to_dict()
         pdf_file = request.files.get('pdf_file')
+        pdf_bytes = pdf_file.read() if pdf_file and pdf_file.filename else None
+        filename = pdf_file.filename if pdf_bytes is not None else None
+    
+    # Target languages; the first one is the language the result is cached for
+    languages = params.get('language') or request.args.get('language', 'en')
+    if isinstance(languages, str):
+        languages = languages.split(',')
+    if not isinstance(languages, list) or not languages or not all(isinstance(code, str) for code in languages):
+        raise PipelineError("'language' must be a language code or a list of codes")
+    languages = list(dict.fromkeys(code.strip() for code in languages))
+    unsupported = [code for code in languages if code not in LANGUAGE_CODES]
+    if unsupported or not languages:
+        raise PipelineError(f"Unsupported language: {', '.join(unsupported)}")
+    
+    fields = params.get('fields') or request.args.get('fields')
+    if not fields:
+        fields = list(API_DEFAULT_FIELDS)
+    elif isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    elif not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        raise PipelineError("'fields' must be a list of field names or a comma-separated string")
+    unknown = [field for field in fields if field not in API_FIELDS]
+    if unknown:
+        raise PipelineError(f"Unknown field: {', '.join(unknown)}")
+    
+    url = params.get('url')
+    text = params.get('text')
+    
+    if isinstance(url, str) and url.strip():
+        parsed_url = urllib.parse.urlparse(url)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise PipelineError('Invalid URL format')
+        return 'url', url, normalize_url(url), languages, fields
+    
+    elif isinstance(text, str) and text.strip():
+        return 'text', text, 'text:' + hash_bytes(text.encode('utf-8')), languages, fields
+    
+    elif pdf_bytes:
+        if not allowed_file(filename):
+            raise PipelineError('Only PDF files are allowed')
+        source = io.BytesIO(pdf_bytes)
+        source.filename = filename
+        return 'pdf', source, 'pdf:' + hash_bytes(pdf_bytes), languages, fields
+    
+    raise PipelineError("Please provide a 'url', 'text' or PDF document")
+
+def api_response(payload, status=200):
+    """
+    Serialize an API payload as compact JSON, gzip-compressed when the client accepts it
+    
+    Args:
+        payload (dict): JSON-serializable response body
+        status (int): HTTP status code
         
-        if url and url.strip():
-            # Process URL
-            source_type = 'url'
-            source_name = url
-            
-            # Validate URL
-            parsed_url = urllib.parse.urlparse(url)
-            if not parsed_url.scheme or not parsed_url.netloc:
-                return jsonify({'error': 'Invalid URL format'}), 400
-            
-            # Extract article content and images
-            logger.debug(f"Extracting content from URL: {url}")
-            article_content, images = extract_article_content(url)
-            
-            if not article_content or len(article_content.strip()) < 50:
-                return jsonify({'error': 'Could not extract meaningful content from the provided URL'}), 400
-            
-        elif pdf_file and pdf_file.filename:
-            # Process PDF file
-            source_type = 'pdf'
-            
-            # Validate file extension
-            if not allowed_file(pdf_file.filename):
-                return jsonify({'error': 'Only PDF files are allowed'}), 400
-            
-            # Extract text from PDF
-            logger.debug(f"Extracting content from PDF: {pdf_file.filename}")
-            article_content, num_pages, source_name = extract_text_from_pdf(pdf_file)
-            
-        else:
-            # Neither URL nor PDF file provided
-            return jsonify({'error': 'Please provide a URL or upload a PDF file'}), 400
+    Returns:
+        Response: The JSON response
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= API_COMPRESS_MIN_BYTES and request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+@app.route('/api/v1/summarize', methods=['POST'])
+def api_summarize():
+    """Summarize a URL, PDF or text and return the requested fields as JSON"""
+    try:
+        source_type, source, source_key, languages, fields = parse_api_request()
+        
+        # The result for the first language is cached like /process results
+        cache_key = make_cache_key(source_key, languages[0], **SUMMARY_OPTIONS)
+        result = process_source(source_type, source, cache_key, languages[0], g.timer)
+        
+        translations = {}
+        if 'translations' in fields:
+            translations[languages[0]] = {
+                'summary': result['translated_summary'],
+                'reading_time': result['translated_reading_time'],
+            }
+            # Further languages are translated together in one call
+            if len(languages) > 1:
+                with g.timer.stage('translate'):
+                    extra = translate_text(result['summary'], languages[1:])
+                for code, translated_summary in extra.items():
+                    translations[code] = {
+                        'summary': translated_summary,
+                        'reading_time': calculate_reading_time(translated_summary),
+                    }
+        
+        values = dict(result, translations=translations, timings_ms=stage_timings_ms())
+        return api_response({field: values[field] for field in fields})
+    
+    except PipelineError as e:
+        return api_response({'error': str(e)}, 400)
+    
+    except Overloaded as e:
+        return overloaded_response(e)
+    
+    except Exception as e:
+        logger.error(f"Error processing API request: {str(e)}")
+        return api_response({'error': f'An error occurred: {str(e)}'}, 500)
+
+def stage_timings_ms():
+    """
+    Total the request's stage durations
+    
+    A stage can run more than once (e.g. translation into extra languages, or
+    one extraction per digest article), so durations add up.
+    
+    Returns:
+        dict: Milliseconds spent in each stage
+    """
+    timings = {}
+    for name, duration in g.timer.spans:
+        timings[name] = timings.get(name, 0.0) + duration
+    return {name: round(duration * 1000, 1) for name, duration in timings.items()}
+
+def parse_digest_request():
+    """
+    Read and validate a /api/v1/digest request
+    
+    'urls' is a list or a newline-separated string, in a JSON body or a form;
+    'language' is a single target language code.
+    
+    Returns:
+        tuple: (urls without equivalent duplicates, in order; target_language)
+        
+    Raises:
+        PipelineError: If the request is invalid
+    """
+    if request.is_json:
+        params = request.get_json(silent=True)
+        if not isinstance(params, dict):
+            raise PipelineError('The request body must be a JSON object')
+    else:
+        params = request.form.to_dict()
+    
+    urls = params.get('urls')
+    if isinstance(urls, str):
+        urls = urls.splitlines()
+    if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        raise PipelineError("'urls' must be a list of URLs")
+    # Spellings of the same page (case, default port, tracking parameters...) are fetched once
+    unique = {}
+    for url in urls:
+        if url.strip():
+            unique.setdefault(normalize_url(url), url.strip())
+    urls = list(unique.values())
+    if not urls:
+        raise PipelineError('Please provide at least one URL')
+    if len(urls) > DIGEST_MAX_URLS:
+        raise PipelineError(f'A digest can combine at most {DIGEST_MAX_URLS} URLs')
+    for url in urls:
+        parsed_url = urllib.parse.urlparse(url)
+        if parsed_url.scheme not in ('http', 'https') or not parsed_url.netloc:
+            raise PipelineError(f'Invalid URL format: {url}')
+    
+    target_language = params.get('language') or request.args.get('language', 'en')
+    if not isinstance(target_language, str):
+        raise PipelineError("'language' must be a language code")
+    if target_language not in LANGUAGE_CODES:
+        raise PipelineError(f'Unsupported language: {target_language}')
+    
+    return urls, target_language
+
+@app.route('/api/v1/digest', methods=['POST'])
+def api_digest():
+    """Summarize many URLs into one digest, fetching them concurrently and dropping repeated sentences"""
+    try:
+        urls, target_language = parse_digest_request()
+        
+        # Articles are summarized in English and cached like /process results; the digest is translated as a whole
+        cache_keys = [make_cache_key(normalize_url(url), 'en', **SUMMARY_OPTIONS) for url in urls]
+        results = [result_cache.get(cache_key) for cache_key in cache_keys]
+        errors = {}
+        
+        # Fetch every uncached page at once, revalidating earlier results
+        overloaded = []
+        missing = [i for i, result in enumerate(results) if result is None]
+        fresh = set()
+        previous = [revalidation_store.get(cache_keys[i]) for i in missing]
+        # Each page takes its own fetch slot inside fetch_pages
+        with g.timer.stage('fetch', admission=False):
+            pages = fetch_pages([urls[i] for i in missing], previous)
+        
+        for i, previous_result, page in zip(missing, previous, pages):
+            try:
+                if isinstance(page, Exception):
+                    raise page
+                result = run_pipeline('url', urls[i], 'en', SUMMARY_OPTIONS, g.timer, previous_result, page)
+            except Exception as e:
+                logger.warning(f"Leaving {urls[i]} out of the digest: {str(e)}")
+                errors[i] = str(e)
+                if isinstance(e, Overloaded):
+                    overloaded.append(e)
+                continue
+            result_cache.set(cache_keys[i], result)
+            revalidation_store.set(cache_keys[i], result)
+            results[i] = result
+            fresh.add(i)
+        
+        with g.timer.stage('merge'):
+            sections, duplicates_removed = merge_summaries([result['summary'] if result else '' for result in results])
+        
+        articles = []
+        for i, (url, result, sentences) in enumerate(zip(urls, results, sections)):
+            article = {'url': url, 'source_name': url, 'summary': None, 'result_id': None, 'error': errors.get(i)}
+            if result:
+                # Keep each article's result server-side so its PDF can be downloaded by id
+                store_result(result, i in fresh)
+                article.update(source_name=result['source_name'], summary=' '.join(sentences), result_id=result['result_id'])
+            articles.append(article)
         
-        # Generate summary
-        logger.debug("Generating summary")
-        summary = summarize_text(article_content)
-        reading_time = calculate_reading_time(summary)
+        digest = '\n\n'.join(article['summary'] for article in articles if article['summary'])
+        # Nothing could be summarized because the server is busy: tell the client when to come back
+        if not digest and overloaded:
+            raise overloaded[0]
+        if not digest:
+            return api_response({'error': 'None of the URLs could be summarized', 'articles': articles}, 502)
         
-        # Translate summary if requested and not already in the target language
+        translated_digest = digest
         if target_language != 'en':
-            logger.debug(f"Translating summary to {target_language}")
-            translated_summary = translate_text(summary, target_language)
-            translated_reading_time = calculate_reading_time(translated_summary)
-        else:
-            translated_summary = summary
-            translated_reading_time = reading_time
-        
-        # Prepare response
-        result = {
-            'source_type': source_type,
-            'source_name': source_name,
-            'original_url': url if source_type == 'url' else None,
-            'article_content': article_content[:1000] + '...' if len(article_content) > 1000 else article_content,
-            'summary': summary,
-            'translated_summary': translated_summary,
-            'target_language': target_language,
-            'reading_time': reading_time,
-            'translated_reading_time': translated_reading_time,
-            'images': images if source_type == 'url' else []
-        }
+            with g.timer.stage('translate'):
+                translated_digest = translate_text(digest, target_language)
         
-        return render_template('result.html', result=result)
+        return api_response({
+            'articles': articles,
+            'digest': digest,
+            'translated_digest': translated_digest,
+            'target_language': target_language,
+            'reading_time': calculate_reading_time(digest),
+            'translated_reading_time': calculate_reading_time(translated_digest),
+            'duplicates_removed': duplicates_removed,
+            'timings_ms': stage_timings_ms(),
+        })
+    
+    except PipelineError as e:
+        return api_response({'error': str(e)}, 400)
+    
+    except Overloaded as e:
+        return overloaded_response(e)
     
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+        logger.error(f"Error building digest: {str(e)}")
+        return api_response({'error': f'An error occurred: {str(e)}'}, 500)
+
+@app.route('/metrics')
+def metrics():
+    """Expose latency histograms, error counters, cache hit rates and in-flight counts for Prometheus"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/ready')
+def ready():
+    """Readiness probe: 200 once this worker has warmed up (see wsgi.py), 503 before"""
+    status = readiness()
+    return jsonify(status), 200 if status['ready'] else 503
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Report result cache hit/miss counters"""
+    return jsonify(result_cache.stats())
+
+@app.route('/admission/stats')
+def admission_status():
+    """Report the running and queued work of each limited stage"""
+    return jsonify(admission_stats())
+
+def send_summary_pdf(source_name, summary, translated_summary, target_language, reading_time, source_type):
+    """
+    Send the summary PDF as a download, or 304 if the client already has it
+    
+    Args:
+        source_name (str): URL of the original article or PDF filename
+        summary (str): Original summary text
+        translated_summary (str): Translated summary text
+        target_language (str): Target language code
+        reading_time (str): Estimated reading time
+        source_type (str): Type of source ('url' or 'pdf')
+        
+    Returns:
+        Response: The PDF download
+    """
+    # The same summary always yields the same ETag, so clients can revalidate without a re-render;
+    # it is weak because the PDF also carries the date it was generated on
+    etag = pdf_etag(source_name, summary, translated_summary, target_language, reading_time, source_type)
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    # Generate PDF in memory (repeat renders of the same summary come from the generator's cache)
+    with g.timer.stage('pdf'):
+        pdf_bytes = generate_pdf(
+            original_url=source_name,
+            summary=summary,
+            translated_summary=translated_summary,
+            target_language=target_language,
+            reading_time=reading_time,
+            source_type=source_type
+        )
+    
+    # Generate filename based on source
+    filename = 'article_summary.pdf'
+    if source_type == 'pdf':
+        filename = f"summary_{os.path.basename(source_name)}"
+    
+    # Stream the PDF straight from memory
+    response = make_response(send_file(
+        io.BytesIO(pdf_bytes),
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=filename,
+        etag=False
+    ))
+    response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/download-pdf', methods=['POST'])
 def download_pdf():
@@ -126,42 +820,49 @@ def download_pdf():
         if not summary or not source_name:
             return jsonify({'error': 'Missing required information'}), 400
         
-        # Get original URL or source identifier
-        original_source = source_name
+        return send_summary_pdf(source_name, summary, translated_summary, target_language, reading_time, source_type)
+    
+    except Overloaded as e:
+        return overloaded_response(e)
+    
+    except Exception as e:
+        logger.error(f"Error generating PDF: {str(e)}")
+        return jsonify({'error': f'An error occurred while generating the PDF: {str(e)}'}), 500
+
+@app.route('/download-pdf/<result_id>')
+def download_pdf_by_id(result_id):
+    """Generate and download the PDF of a stored result, optionally in another language"""
+    try:
+        result = result_store.get(result_id)
+        if not result:
+            return jsonify({'error': 'Unknown or expired result'}), 404
         
-        # Generate PDF
-        pdf_file = generate_pdf(
-            original_url=original_source,
-            summary=summary,
-            translated_summary=translated_summary,
-            target_language=target_language,
-            reading_time=reading_time,
-            source_type=source_type
+        # Use the stored translation unless a different language is requested
+        target_language = request.args.get('language', result['target_language'])
+        if target_language not in LANGUAGE_CODES:
+            return jsonify({'error': 'Unsupported language'}), 400
+        if target_language == result['target_language']:
+            translated_summary = result['translated_summary']
+        else:
+            with g.timer.stage('translate'):
+                translated_summary = translate_text(result['summary'], target_language)
+        
+        response = send_summary_pdf(
+            result['source_name'],
+            result['summary'],
+            translated_summary,
+            target_language,
+            result['reading_time'],
+            result['source_type']
         )
         
-        # Generate filename based on source
-        filename = 'article_summary.pdf'
-        if source_type == 'pdf':
-            filename = f"summary_{os.path.basename(source_name)}"
-        
-        # Prepare response
-        response = make_response(send_file(
-            pdf_file,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        ))
-        
-        # Clean up temporary file after sending
-        @response.call_on_close
-        def cleanup():
-            try:
-                os.unlink(pdf_file)
-            except:
-                pass
-                
+        # Stored results never change, so the browser may reuse the download until it expires
+        response.headers['Cache-Control'] = f"private, max-age={app.config['RESULT_STORE_TTL']}"
         return response
     
+    except Overloaded as e:
+        return overloaded_response(e)
+    
     except Exception as e:
         logger.error(f"Error generating PDF: {str(e)}")
         return jsonify({'error': f'An error occurred while generating the PDF: {str(e)}'}), 500
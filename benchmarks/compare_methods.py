@@ -0,0 +1,113 @@
+"""
+Compare the sentence scoring methods of utils/summarizer.py.
+
+For every text the script times summarize_text with each method (median and
+p95, as in run_benchmarks.py) and reports two reference-free quality proxies:
+
+- coverage: cosine similarity between the content-word counts of the summary
+  and of the whole text (higher means the summary covers more of the text;
+  longer summaries score higher, so read it together with the word count)
+- redundancy: mean pairwise Jaccard overlap between the content words of the
+  summary's sentences (lower means less repetition)
+
+The texts are the checked-in HTML fixtures, plus every .txt file in --texts.
+
+Usage (from the repository root):
+    python benchmarks/compare_methods.py
+    python benchmarks/compare_methods.py --texts ~/articles --iterations 10 --output methods.json
+"""
+import argparse
+import glob
+import itertools
+import json
+import math
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.run_benchmarks import FIXTURES_DIR, HTML_FIXTURES, measure
+from utils.scraper import extract_content_from_html
+from utils import summarizer
+
+# (label, method, redundancy penalty)
+VARIANTS = [
+    ('frequency', 'frequency', 0.0),
+    ('tfidf', 'tfidf', 0.0),
+    ('textrank', 'textrank', 0.0),
+    ('tfidf+mmr', 'tfidf', 0.3),
+    ('textrank+mmr', 'textrank', 0.3),
+]
+
+def load_texts(texts_dir=None):
+    """
+    Collect the texts to compare on
+    
+    Args:
+        texts_dir (str): Directory with additional .txt files (optional)
+    
+    Returns:
+        list: (name, text) tuples
+    """
+    texts = []
+    for name in HTML_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), encoding='utf-8') as f:
+            text, images = extract_content_from_html(f.read())
+        texts.append((name, text))
+    
+    if texts_dir:
+        for path in sorted(glob.glob(os.path.join(texts_dir, '*.txt'))):
+            with open(path, encoding='utf-8', errors='ignore') as f:
+                texts.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    
+    return texts
+
+def content_words(text):
+    return summarizer.count_words(summarizer.preprocess_text(text))
+
+def coverage(summary, text):
+    """Cosine similarity between the content-word counts of the summary and the text"""
+    a, b = content_words(summary), content_words(text)
+    dot = sum(count * b[word] for word, count in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+def redundancy(summary):
+    """Mean pairwise Jaccard overlap between the content words of the summary's sentences"""
+    sentences = [set(content_words(sent)) for sent in summarizer.split_sentences(summary)]
+    sentences = [words for words in sentences if words]
+    pairs = list(itertools.combinations(sentences, 2))
+    if not pairs:
+        return 0.0
+    return sum(len(a & b) / len(a | b) for a, b in pairs) / len(pairs)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare summarizer scoring methods on latency and quality proxies")
+    parser.add_argument('--texts', help="Directory of additional .txt files")
+    parser.add_argument('--iterations', type=int, default=20, help="Timed iterations per case")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    results = []
+    print(f"{'text':<16}{'method':<15}{'median ms':>11}{'p95 ms':>10}{'words':>8}{'coverage':>10}{'redundancy':>12}")
+    for name, text in load_texts(args.texts):
+        for label, method, penalty in VARIANTS:
+            summarize = lambda: summarizer.summarize_text(text, method=method, redundancy_penalty=penalty)
+            stats = measure(summarize, args.iterations)
+            summary = summarize()
+            result = dict(
+                text=name, method=label, words=len(summary.split()), coverage=round(coverage(summary, text), 4),
+                redundancy=round(redundancy(summary), 4), **stats
+            )
+            results.append(result)
+            print(f"{name:<16}{label:<15}{stats['median_ms']:>11.3f}{stats['p95_ms']:>10.3f}{result['words']:>8}{result['coverage']:>10.4f}{result['redundancy']:>12.4f}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'results': results}, f, indent=2)
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
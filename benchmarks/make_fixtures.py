@@ -0,0 +1,95 @@
+"""
+Regenerate the benchmark fixture corpus in benchmarks/fixtures.
+
+The corpus is synthetic and seeded, so regenerating it produces the same
+pages and documents. Run from the repository root:
+
+    python benchmarks/make_fixtures.py
+"""
+import os
+import random
+from fpdf import FPDF
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# HTML pages: name -> number of paragraphs
+HTML_SIZES = {'small': 8, 'medium': 60, 'large': 400}
+
+# PDFs: name -> number of pages
+PDF_SIZES = {'short': 5, 'report': 40, 'book': 150}
+
+SUBJECTS = [
+    'The city council', 'Researchers', 'The central bank', 'Local farmers', 'The new policy',
+    'Engineers', 'The study', 'Investors', 'The committee', 'Health officials', 'The company',
+    'Teachers', 'The government', 'Scientists', 'The report', 'Residents',
+]
+VERBS = [
+    'announced', 'reported', 'warned', 'argued', 'found', 'suggested', 'confirmed',
+    'estimated', 'predicted', 'questioned', 'reviewed', 'approved', 'rejected', 'measured',
+]
+OBJECTS = [
+    'a sharp rise in energy prices', 'new rules for water management', 'the impact of the drought',
+    'a plan to expand public transport', 'higher interest rates next year', 'record harvests in the north',
+    'changes to the school curriculum', 'a decline in hospital waiting times', 'the cost of the new bridge',
+    'stronger demand for electric vehicles', 'the results of the climate survey', 'a shortage of skilled workers',
+    'the long-term effects of inflation', 'a new method for recycling plastics', 'the growth of remote work',
+]
+CLAUSES = [
+    'according to figures published on Monday', 'despite earlier concerns', 'after months of debate',
+    'which surprised many analysts', 'although the details remain unclear', 'in a statement to reporters',
+    'as part of a wider review', 'while critics called for caution', 'for the third year in a row',
+]
+
+def make_sentence(rng):
+    sentence = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}"
+    if rng.random() < 0.6:
+        sentence += f", {rng.choice(CLAUSES)}"
+    return sentence + '.'
+
+def make_paragraph(rng):
+    return ' '.join(make_sentence(rng) for _ in range(rng.randint(3, 7)))
+
+def write_html(name, paragraphs, rng):
+    body = '\n'.join(f"<p>{make_paragraph(rng)}</p>" for _ in range(paragraphs))
+    images = '\n'.join(f'<img src="/images/photo{i}.jpg" width="640" height="480">' for i in range(3))
+    html = f"""<!DOCTYPE html>
+<html>
+<head>
+<title>Benchmark article ({name})</title>
+<meta property="og:image" content="/images/cover.jpg">
+<script>var analytics = {{}};</script>
+</head>
+<body>
+<header><nav><a href="/">Home</a> <a href="/news">News</a></nav></header>
+<div class="layout"><div class="sidebar"><p>Related stories</p><img src="/images/logo.png"></div>
+<article>
+<h1>Benchmark article ({name})</h1>
+{images}
+{body}
+</article>
+</div>
+<footer><p>Copyright notice</p></footer>
+</body>
+</html>
+"""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+def write_pdf(name, pages, rng):
+    pdf = FPDF()
+    pdf.set_font('Arial', '', 11)
+    for _ in range(pages):
+        pdf.add_page()
+        pdf.multi_cell(0, 5, '\n\n'.join(make_paragraph(rng) for _ in range(6)))
+    pdf.output(os.path.join(FIXTURES_DIR, f"{name}.pdf"))
+
+def main():
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    rng = random.Random(42)
+    for name, paragraphs in HTML_SIZES.items():
+        write_html(name, paragraphs, rng)
+    for name, pages in PDF_SIZES.items():
+        write_pdf(name, pages, rng)
+
+if __name__ == '__main__':
+    main()
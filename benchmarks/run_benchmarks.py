@@ -0,0 +1,252 @@
+"""
+Offline micro-benchmarks for the processing stages in utils/.
+
+Each stage is timed on its own against the checked-in corpus in
+benchmarks/fixtures: HTML pages are served from a local HTTP server and
+translation goes through a stub instead of the real provider, so no network
+access is needed. For every case the runner reports the median and p95
+wall-clock time and the peak Python memory allocated (via tracemalloc), and
+writes the results as JSON so two runs can be compared.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --only summarize_text --iterations 50
+    python benchmarks/run_benchmarks.py --output new.json --compare bench.json
+"""
+import argparse
+import functools
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'fixtures')
+sys.path.insert(0, ROOT_DIR)
+
+# Keep the translation memory off disk so every run starts cold
+os.environ.setdefault('TRANSLATION_MEMORY_URL', '')
+
+from utils import translator
+from utils.scraper import extract_article_content
+from utils.pdf_extractor import extract_text_from_pdf
+from utils.summarizer import summarize_text
+from utils.pdf_generator import generate_pdf, _render_pdf
+
+HTML_FIXTURES = ['small', 'medium', 'large']
+PDF_FIXTURES = ['short', 'report', 'book']
+
+class StubTranslator:
+    """Offline stand-in for GoogleTranslator that returns the text unchanged after a fixed delay"""
+    
+    latency = 0.0
+    
+    def __init__(self, source='auto', target='en'):
+        self.target = target
+    
+    def translate(self, text):
+        if self.latency:
+            time.sleep(self.latency)
+        return text
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the fixtures directory without logging every request"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+    
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server():
+    """
+    Serve the fixtures directory on a free local port
+    
+    Returns:
+        tuple: (server, base URL)
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def measure(func, iterations, warmup=1, reset=None):
+    """
+    Time a callable and measure its peak memory
+    
+    Args:
+        func: Callable to benchmark
+        iterations (int): Timed calls
+        warmup (int): Untimed calls made first
+        reset: Called before every call to clear caches (optional)
+    
+    Returns:
+        dict: Timing and memory statistics
+    """
+    for _ in range(warmup):
+        if reset:
+            reset()
+        func()
+    
+    timings = []
+    for _ in range(iterations):
+        if reset:
+            reset()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    # Peak memory is measured on a separate call, since tracemalloc slows everything down
+    if reset:
+        reset()
+    tracemalloc.start()
+    func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        'iterations': iterations,
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(percentile(timings, 0.95), 3),
+        'min_ms': round(min(timings), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+def reset_translation_memory():
+    translator.translation_memory.clear()
+
+def build_cases(base_url):
+    """
+    List the benchmark cases
+    
+    Args:
+        base_url (str): URL of the local fixture server
+    
+    Returns:
+        list: (stage name, case name, callable, reset callable) tuples
+    """
+    cases = []
+    
+    for name in HTML_FIXTURES:
+        url = f"{base_url}/{name}.html"
+        cases.append(('extract_article_content', name, functools.partial(extract_article_content, url), None))
+    
+    for name in PDF_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, f"{name}.pdf"), 'rb') as f:
+            data = f.read()
+        
+        def extract(data=data, name=name):
+            pdf_file = io.BytesIO(data)
+            pdf_file.filename = f"{name}.pdf"
+            return extract_text_from_pdf(pdf_file)
+        
+        cases.append(('extract_text_from_pdf', name, extract, None))
+    
+    # Summaries and translations run on the text the scraper extracts from each page
+    summaries = {}
+    for name in HTML_FIXTURES:
+        text, images = extract_article_content(f"{base_url}/{name}.html")
+        summaries[name] = summarize_text(text)
+        cases.append(('summarize_text', name, functools.partial(summarize_text, text), None))
+    
+    for name in HTML_FIXTURES:
+        cases.append(('translate_text', name, functools.partial(translator.translate_text, summaries[name], 'fr'), reset_translation_memory))
+    
+    for name in HTML_FIXTURES:
+        summary = summaries[name]
+        render = functools.partial(
+            generate_pdf,
+            original_url=f"{base_url}/{name}.html",
+            summary=summary,
+            translated_summary=summary,
+            target_language='fr',
+            reading_time='1 min read',
+            source_type='url'
+        )
+        cases.append(('generate_pdf', name, render, _render_pdf.cache_clear))
+    
+    return cases
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare(results, baseline_path):
+    """Print the median change of every case against an earlier results file"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['stage'], r['case']): r for r in json.load(f)['results']}
+    
+    print(f"\n{'stage':<26}{'case':<10}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for result in results:
+        before = baseline.get((result['stage'], result['case']))
+        if not before:
+            continue
+        change = (result['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0.0
+        print(f"{result['stage']:<26}{result['case']:<10}{before['median_ms']:>14.3f}{result['median_ms']:>14.3f}{change:>+9.1f}%")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline per-stage benchmarks")
+    parser.add_argument('--iterations', type=int, default=20, help="Timed iterations per case")
+    parser.add_argument('--only', action='append', help="Only run this stage (repeatable)")
+    parser.add_argument('--translator-latency', type=float, default=0.0, help="Simulated provider latency in seconds")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Earlier JSON results to compare against")
+    args = parser.parse_args(argv)
+    
+    StubTranslator.latency = args.translator_latency
+    translator.GoogleTranslator = StubTranslator
+    
+    server, base_url = start_fixture_server()
+    try:
+        results = []
+        for stage, case, func, reset in build_cases(base_url):
+            if args.only and stage not in args.only:
+                continue
+            stats = measure(func, args.iterations, reset=reset)
+            results.append(dict(stage=stage, case=case, **stats))
+            print(f"{stage:<26}{case:<10} median {stats['median_ms']:>10.3f} ms  p95 {stats['p95_ms']:>10.3f} ms  peak {stats['peak_kb']:>10.1f} KB")
+    finally:
+        server.shutdown()
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'iterations': args.iterations,
+            'translator_latency': args.translator_latency,
+        },
+        'results': results,
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        compare(results, args.compare)
+    
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,257 @@
+"""
+Offline bulk summarization.
+
+Summarizes a directory of PDFs and/or a list of URLs and saved HTML pages,
+spreading the work over a pool of processes. Each worker extracts a batch of
+documents and summarizes them with a single batched nlp.pipe call. Results are
+streamed to a JSONL file one line per document, so an interrupted run can be
+resumed and skips everything already written.
+
+Usage:
+    python bulk_summarize.py --pdf-dir reports/ --output summaries.jsonl
+    python bulk_summarize.py --inputs links.txt --output summaries.jsonl --workers 8
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from utils.scraper import extract_article_content, extract_content_from_html
+from utils.summarizer import summarize_texts, calculate_reading_time, SCORING_METHODS, DEFAULT_SCORING_METHOD
+from utils.pdf_extractor import extract_text_from_pdf
+
+logger = logging.getLogger(__name__)
+
+def collect_sources(pdf_dir=None, inputs_file=None):
+    """
+    List the documents to summarize
+
+    Args:
+        pdf_dir (str): Directory to scan for PDF files (optional)
+        inputs_file (str): File with one URL or HTML snapshot path per line (optional)
+
+    Returns:
+        list: (source_type, source) tuples, where source_type is 'pdf', 'url' or 'html'
+    """
+    sources = []
+
+    if pdf_dir:
+        for name in sorted(os.listdir(pdf_dir)):
+            if name.lower().endswith('.pdf'):
+                sources.append(('pdf', os.path.join(pdf_dir, name)))
+
+    if inputs_file:
+        base_dir = os.path.dirname(os.path.abspath(inputs_file))
+        with open(inputs_file, encoding='utf-8') as f:
+            for line in f:
+                entry = line.strip()
+                if not entry or entry.startswith('#'):
+                    continue
+                if entry.startswith(('http://', 'https://')):
+                    sources.append(('url', entry))
+                else:
+                    # Snapshot paths are relative to the inputs file
+                    sources.append(('html', os.path.join(base_dir, entry)))
+
+    return sources
+
+def load_completed(output_path):
+    """
+    Read the sources that already have a successful result in the output file
+
+    Args:
+        output_path (str): Path of the JSONL results file
+
+    Returns:
+        set: Sources that can be skipped
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash; the source will be redone
+                continue
+            if not record.get('error'):
+                completed.add(record['source'])
+
+    return completed
+
+def trim_partial_record(output_path):
+    """
+    Cut a record left unfinished by a crash off the end of the output file
+
+    Appending after a partial last line would join the next record onto it and
+    lose both, so the file is truncated back to just after its last newline.
+
+    Args:
+        output_path (str): Path of the JSONL results file
+    """
+    if not os.path.exists(output_path):
+        return
+
+    with open(output_path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            logger.warning(f"Dropping an unfinished record at the end of {output_path}")
+            f.truncate(position)
+
+def extract_source(source_type, source):
+    """
+    Extract the text (and images) of a single source
+
+    Args:
+        source_type (str): 'pdf', 'url' or 'html'
+        source (str): File path or URL
+
+    Returns:
+        tuple: (Extracted text content, List of image URLs)
+    """
+    if source_type == 'pdf':
+        with open(source, 'rb') as pdf_file:
+            text_content, num_pages, filename = extract_text_from_pdf(pdf_file)
+        return text_content, []
+
+    if source_type == 'html':
+        with open(source, encoding='utf-8', errors='replace') as f:
+            return extract_content_from_html(f.read())
+
+    return extract_article_content(source)
+
+def process_batch(batch, summary_options):
+    """
+    Extract and summarize a batch of sources inside a worker process
+
+    Args:
+        batch (list): (source_type, source) tuples
+        summary_options (dict): Keyword arguments for summarize_texts
+
+    Returns:
+        list: Result records, one per source
+    """
+    records = []
+    extracted = []
+
+    for source_type, source in batch:
+        record = {'source': source, 'source_type': source_type, 'error': None}
+        try:
+            text_content, images = extract_source(source_type, source)
+            if not text_content or len(text_content.strip()) < 50:
+                raise ValueError("Could not extract meaningful content")
+            record['images'] = images
+            extracted.append((record, text_content))
+        except Exception as e:
+            record['error'] = str(e)
+        records.append(record)
+
+    # One batched pipeline call for everything that was extracted
+    summaries = summarize_texts([text for record, text in extracted], **summary_options)
+    for (record, text_content), summary in zip(extracted, summaries):
+        record['summary'] = summary
+        record['reading_time'] = calculate_reading_time(summary)
+
+    return records
+
+def run(sources, output_path, workers=None, batch_size=16, summary_options=None):
+    """
+    Summarize sources across a process pool, appending results to a JSONL file as they finish
+
+    Args:
+        sources (list): (source_type, source) tuples
+        output_path (str): Path of the JSONL results file
+        workers (int): Number of worker processes (default: CPU count)
+        batch_size (int): Number of sources per worker task
+        summary_options (dict): Keyword arguments for summarize_texts (optional)
+
+    Returns:
+        tuple: (Number of documents summarized, number of failures)
+    """
+    summary_options = dict(summary_options or {})
+    summary_options.setdefault('batch_size', batch_size)
+    workers = workers or os.cpu_count() or 1
+
+    trim_partial_record(output_path)
+    completed = load_completed(output_path)
+    pending = [source for source in sources if source[1] not in completed]
+    logger.info(f"{len(completed)} sources already done, {len(pending)} to process")
+
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    succeeded = failed = 0
+
+    with open(output_path, 'a', encoding='utf-8') as out, ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep a bounded number of batches in flight so memory stays flat on huge inputs
+        in_flight = set()
+        next_batch = 0
+        while next_batch < len(batches) or in_flight:
+            while next_batch < len(batches) and len(in_flight) < workers * 2:
+                in_flight.add(executor.submit(process_batch, batches[next_batch], summary_options))
+                next_batch += 1
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    if record['error']:
+                        failed += 1
+                        logger.warning(f"Failed to summarize {record['source']}: {record['error']}")
+                    else:
+                        succeeded += 1
+                # Flush per batch so a crash loses at most the batches still running
+                out.flush()
+                os.fsync(out.fileno())
+
+    return succeeded, failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize many PDFs, URLs and HTML snapshots into a JSONL file")
+    parser.add_argument('--pdf-dir', help="Directory of PDF files to summarize")
+    parser.add_argument('--inputs', help="File with one URL or HTML snapshot path per line")
+    parser.add_argument('--output', required=True, help="JSONL file to append results to (resumes if it exists)")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=16, help="Documents per worker task and nlp.pipe batch")
+    parser.add_argument('--summary-percentage', type=float, default=0.3)
+    parser.add_argument('--min-sentences', type=int, default=3)
+    parser.add_argument('--max-sentences', type=int, default=10)
+    parser.add_argument('--method', choices=SCORING_METHODS, default=DEFAULT_SCORING_METHOD, help="Sentence scoring method")
+    parser.add_argument('--redundancy-penalty', type=float, default=0.0, help="Penalize sentences similar to ones already picked (0-1)")
+    args = parser.parse_args(argv)
+
+    if not args.pdf_dir and not args.inputs:
+        parser.error("Provide --pdf-dir and/or --inputs")
+
+    logging.basicConfig(level=logging.INFO)
+
+    sources = collect_sources(args.pdf_dir, args.inputs)
+    succeeded, failed = run(
+        sources,
+        args.output,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        summary_options={
+            'summary_percentage': args.summary_percentage,
+            'min_sentences': args.min_sentences,
+            'max_sentences': args.max_sentences,
+            'method': args.method,
+            'redundancy_penalty': args.redundancy_penalty,
+        }
+    )
+    logger.info(f"Summarized {succeeded} documents, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Gunicorn settings for production deployments.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is loaded and warmed up once in the master (see wsgi.py), then the
+workers are forked from it.
+"""
+import os
+import multiprocessing
+
+wsgi_app = 'wsgi:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Load the app before forking so workers share the model copy-on-write
+preload_app = True
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Background jobs, stored results, the result cache and in-flight /process runs are
+# shared between workers through this database; without it a request only sees its
+# own worker's state.
+# Metrics and admission limits stay per worker either way. The SQLite default
+# (WAL mode, writers queue for SQLITE_BUSY_TIMEOUT seconds) is meant for
+# development on a single host; point RESULT_CACHE_URL at PostgreSQL in production.
+os.environ.setdefault('RESULT_CACHE_URL', 'sqlite:///result_cache.db')
+if workers > 1 and not os.environ['RESULT_CACHE_URL']:
+    raise RuntimeError("RESULT_CACHE_URL must name a shared database when running more than one worker")
+
+# Every worker has its own process pools for long documents and large PDFs; split
+# the CPUs between them instead of giving each worker one process per CPU
+pool_workers = str(max(1, multiprocessing.cpu_count() // workers))
+os.environ.setdefault('SUMMARIZER_WORKERS', pool_workers)
+os.environ.setdefault('PDF_WORKERS', pool_workers)
+
+# Threads keep job event streams from tying up a whole worker
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Long documents can take a while to summarize
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Recycle workers now and then; a replacement is forked warm from the master
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+
+def post_fork(server, worker):
+    """Give each worker its own database connections instead of the master's"""
+    from utils.cache import dispose_inherited_connections
+    dispose_inherited_connections()
+
+def when_ready(server):
+    """Refuse to serve from several workers if the shared database could not be opened"""
+    if server.cfg.workers <= 1 or not server.cfg.preload_app:
+        return
+    from app import result_store, job_manager
+    if result_store.store is None or job_manager.store is None:
+        raise RuntimeError("Could not open the shared database at RESULT_CACHE_URL, which is required with more than one worker")
@@ -77,11 +77,64 @@ document.addEventListener('DOMContentLoaded', function() {
             spinner.classList.remove('d-none');
             btnText.textContent = 'Processing...';
             
-            // Submit the form
-            articleForm.submit();
+            // Without fetch support, fall back to a regular (blocking) form post
+            if (!window.fetch || !window.FormData) {
+                articleForm.submit();
+                return;
+            }
+            
+            submitJob(new FormData(articleForm));
         });
     }
     
+    // Stage names shown while a job is running
+    const stageLabels = {
+        fetch: 'Fetching page',
+        extract: 'Extracting content',
+        summarize: 'Summarizing',
+        translate: 'Translating'
+    };
+    
+    // Submit the form as a background job and poll it until it finishes
+    function submitJob(formData) {
+        fetch('/jobs', { method: 'POST', body: formData })
+            .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+            .then(({ ok, data }) => {
+                if (!ok) {
+                    throw new Error(data.error || 'Could not start processing');
+                }
+                pollJob(data.status_url);
+            })
+            .catch(error => showError(error.message));
+    }
+    
+    function pollJob(statusUrl) {
+        fetch(statusUrl)
+            .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+            .then(({ ok, data }) => {
+                if (!ok) {
+                    throw new Error(data.error || 'Lost track of the processing job');
+                }
+                
+                if (data.status === 'done') {
+                    btnText.textContent = 'Done';
+                    window.location.href = data.result_url;
+                    return;
+                }
+                
+                if (data.status === 'failed') {
+                    throw new Error(data.error || 'Processing failed');
+                }
+                
+                // Show the stage currently running
+                const running = data.stages.find(stage => stage.status === 'running');
+                btnText.textContent = running ? (stageLabels[running.name] || running.name) + '...' : 'Waiting in queue...';
+                
+                setTimeout(() => pollJob(statusUrl), 1000);
+            })
+            .catch(error => showError(error.message));
+    }
+    
     // Tab switching behavior
     if (urlTab && pdfTab) {
         urlTab.addEventListener('shown.bs.tab', function() {
@@ -0,0 +1,57 @@
+import threading
+import time
+import pytest
+from utils.cache import ResultCache, SQLCacheStore, SingleFlight
+
+KEY = 'a' * 64
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'shared.db'}"
+
+def worker(database_url):
+    """A result cache and coalescer as each gunicorn worker builds them, sharing one database"""
+    cache = ResultCache(database_url=database_url)
+    return cache, SingleFlight(store=SQLCacheStore(database_url, 'flights'), lookup=cache.get, poll_interval=0.05)
+
+def test_workers_share_one_call(database_url):
+    calls = []
+    
+    def build(cache):
+        calls.append(1)
+        time.sleep(0.3)
+        result = {'summary': 'shared'}
+        cache.set(KEY, result)
+        return result
+    
+    (cache_a, flights_a), (cache_b, flights_b) = worker(database_url), worker(database_url)
+    leader = threading.Thread(target=flights_a.do, args=(KEY, build, cache_a))
+    leader.start()
+    time.sleep(0.1)
+    result, shared = flights_b.do(KEY, build, cache_b)
+    leader.join()
+    
+    assert (result, shared) == ({'summary': 'shared'}, True)
+    assert len(calls) == 1
+    assert flights_b.stats() == {'calls': 1, 'shared': 1, 'in_flight': 0}
+
+def test_failed_call_is_run_again_by_waiting_worker(database_url):
+    def fail():
+        time.sleep(0.2)
+        raise RuntimeError('upstream failed')
+    
+    (_, flights_a), (cache_b, flights_b) = worker(database_url), worker(database_url)
+    leader = threading.Thread(target=lambda: pytest.raises(RuntimeError, flights_a.do, KEY, fail))
+    leader.start()
+    time.sleep(0.05)
+    assert flights_b.do(KEY, lambda: {'summary': 'own'}) == ({'summary': 'own'}, False)
+    leader.join()
+
+def test_claim_of_dead_worker_lapses(database_url):
+    cache, flights = worker(database_url)
+    flights.store.claim(KEY, '{"pid": 0}', time.time() + 0.2)
+    
+    started = time.time()
+    assert flights.do(KEY, lambda: {'summary': 'own'}) == ({'summary': 'own'}, False)
+    assert time.time() - started >= 0.15
+    assert flights.store.get(KEY) is None
@@ -0,0 +1,57 @@
+import codecs
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils import scraper
+
+PAGES = {
+    # UTF-8 page served with a bare Content-Type: requests would guess ISO-8859-1
+    '/utf8': ('text/html', '<html><body><p>Café résumé naïve</p></body></html>'.encode('utf-8')),
+    '/meta-latin1': (
+        'text/html',
+        '<html><head><meta charset="iso-8859-1"></head><body><p>Café résumé</p></body></html>'.encode('latin-1'),
+    ),
+    '/header-charset': ('text/html; charset=windows-1252', '<p>Café – résumé</p>'.encode('cp1252')),
+    # Long enough to be decoded over many chunks, with multi-byte characters across their boundaries
+    '/long-utf8': ('text/html', ('<p>' + 'Crème brûlée à la carte. ' * 20000 + '</p>').encode('utf-8')),
+}
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_utf8_page_without_charset_header(server):
+    html = scraper.fetch_html(f"{server}/utf8")
+    assert 'Café résumé naïve' in html
+    assert 'Ã' not in html
+
+def test_meta_charset_is_used_without_charset_header(server):
+    assert 'Café résumé' in scraper.fetch_html(f"{server}/meta-latin1")
+
+def test_header_charset_takes_precedence(server):
+    assert 'Café – résumé' in scraper.fetch_html(f"{server}/header-charset")
+
+def test_sniffed_encoding_for_unlabelled_bytes():
+    assert scraper._sniff_encoding('text/html', 'Café'.encode('utf-8')) == 'utf-8'
+    assert scraper._sniff_encoding('text/html', codecs.BOM_UTF8 + b'<p>x</p>') == 'utf-8-sig'
+def test_long_page_is_decoded_across_chunks(server):
+    html = scraper.fetch_html(f"{server}/long-utf8")
+    assert html.count('Crème brûlée à la carte.') == 20000
+    assert '\ufffd' not in html
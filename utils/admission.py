@@ -0,0 +1,198 @@
+import os
+import math
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
+from utils.metrics import ADMISSION_IN_PROGRESS, ADMISSION_QUEUE_DEPTH, ADMISSION_WAIT, ADMISSION_REJECTED
+
+# Longest a request waits in a stage queue before it is turned away
+ADMISSION_MAX_WAIT = float(os.environ.get('ADMISSION_MAX_WAIT', 15))
+
+# Bounds on the Retry-After hint sent with a rejection, in seconds
+RETRY_AFTER_MIN = 1
+RETRY_AFTER_MAX = 60
+
+# Default (concurrent, queued) limits of each stage in this process; override with
+# ADMISSION_<STAGE>_CONCURRENCY and ADMISSION_<STAGE>_QUEUE, where a concurrency of 0 disables the limit
+STAGE_LIMITS = {
+    'fetch': (16, 64),
+    'summarize': (os.cpu_count() or 1, 32),
+    'translate': (4, 32),
+    'pdf': (2, 16),
+}
+
+# Concurrent and queued fetches per origin host
+FETCH_PER_HOST = int(os.environ.get('FETCH_PER_HOST', 4))
+FETCH_PER_HOST_QUEUE = int(os.environ.get('FETCH_PER_HOST_QUEUE', 16))
+
+# Idle per-host limiters are dropped once there are more than this many
+MAX_TRACKED_HOSTS = 1024
+
+class Overloaded(Exception):
+    """Raised when a stage is too busy to take more work; retry_after is a hint in seconds"""
+    
+    def __init__(self, message, stage, retry_after):
+        super().__init__(message)
+        self.stage = stage
+        self.retry_after = retry_after
+
+class StageLimiter:
+    """
+    Caps the work running in a stage, queueing the excess in arrival order
+    
+    A request that finds the queue full, or does not get a slot within max_wait
+    seconds, is rejected with Overloaded right away instead of piling onto a
+    saturated stage, so the requests that are admitted keep a predictable latency.
+    """
+    
+    def __init__(self, stage, max_concurrent, max_queued, max_wait=ADMISSION_MAX_WAIT, action=None):
+        self.stage = stage
+        self.action = action or stage  # completes "waiting to ..." in rejection messages
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+        self._running = 0
+        self._queue = deque()  # one Event per waiting request, set when it is handed a slot
+        self._service_time = None  # moving average of how long a slot is held, in seconds
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def slot(self):
+        """
+        Hold one of the stage's slots, waiting for it if needed
+        
+        Raises:
+            Overloaded: If the queue is full or no slot became free in time
+        """
+        self._acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - start)
+    
+    def _acquire(self):
+        start = time.perf_counter()
+        with self._lock:
+            if self._running < self.max_concurrent and not self._queue:
+                self._running += 1
+                ADMISSION_IN_PROGRESS.inc(stage=self.stage)
+                ADMISSION_WAIT.observe(0.0, stage=self.stage)
+                return
+            if len(self._queue) >= self.max_queued:
+                raise self._reject('queue_full', f"Too many requests are waiting to {self.action}")
+            ticket = threading.Event()
+            self._queue.append(ticket)
+            ADMISSION_QUEUE_DEPTH.inc(stage=self.stage)
+        
+        ticket.wait(self.max_wait)
+        
+        with self._lock:
+            # The slot may have been handed over between the timeout and taking the lock
+            if not ticket.is_set():
+                self._queue.remove(ticket)
+                ADMISSION_QUEUE_DEPTH.dec(stage=self.stage)
+                raise self._reject('timeout', f"Timed out waiting to {self.action}")
+        ADMISSION_WAIT.observe(time.perf_counter() - start, stage=self.stage)
+    
+    def _release(self, held):
+        with self._lock:
+            self._service_time = held if self._service_time is None else 0.8 * self._service_time + 0.2 * held
+            if self._queue:
+                # Hand the slot straight to the longest waiting request, so newcomers cannot jump the queue
+                self._queue.popleft().set()
+                ADMISSION_QUEUE_DEPTH.dec(stage=self.stage)
+            else:
+                self._running -= 1
+                ADMISSION_IN_PROGRESS.dec(stage=self.stage)
+    
+    def _reject(self, reason, message):
+        """Build the Overloaded error for a rejection; called with the lock held"""
+        ADMISSION_REJECTED.inc(stage=self.stage, reason=reason)
+        # Time for the running and queued work to drain at the recent pace
+        backlog = (len(self._queue) + self._running) * (self._service_time or RETRY_AFTER_MIN) / self.max_concurrent
+        retry_after = min(RETRY_AFTER_MAX, max(RETRY_AFTER_MIN, math.ceil(backlog)))
+        return Overloaded(f"{message}, please retry in {retry_after} seconds", self.stage, retry_after)
+    
+    def is_idle(self):
+        with self._lock:
+            return not self._running and not self._queue
+    
+    def stats(self):
+        """
+        Report the limiter's configuration and current load
+        
+        Returns:
+            dict: Limits, running and queued work, and the average slot hold time
+        """
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+                'running': self._running,
+                'queued': len(self._queue),
+                'avg_service_ms': round(self._service_time * 1000, 1) if self._service_time is not None else None,
+            }
+
+def _stage_limiter(stage, concurrency, queued):
+    concurrency = int(os.environ.get(f'ADMISSION_{stage.upper()}_CONCURRENCY', concurrency))
+    queued = int(os.environ.get(f'ADMISSION_{stage.upper()}_QUEUE', queued))
+    return StageLimiter(stage, concurrency, queued) if concurrency > 0 else None
+
+_limiters = {stage: _stage_limiter(stage, *limits) for stage, limits in STAGE_LIMITS.items()}
+_limiters = {stage: limiter for stage, limiter in _limiters.items() if limiter}
+
+_hosts = {}
+_hosts_lock = threading.Lock()
+
+def admit(stage):
+    """
+    Hold a slot of the given stage while the block runs
+    
+    Args:
+        stage (str): Stage name; stages without a limit are admitted immediately
+    
+    Returns:
+        A context manager that raises Overloaded if the stage is saturated
+    """
+    limiter = _limiters.get(stage)
+    return limiter.slot() if limiter else nullcontext()
+
+def admit_host(url):
+    """
+    Hold one of the fetch slots of the URL's host while the block runs
+    
+    Args:
+        url (str): URL about to be fetched
+    
+    Returns:
+        A context manager that raises Overloaded if the host already has too many fetches
+    """
+    if FETCH_PER_HOST <= 0:
+        return nullcontext()
+    host = urlparse(url).netloc.lower()
+    with _hosts_lock:
+        limiter = _hosts.get(host)
+        if limiter is None:
+            if len(_hosts) >= MAX_TRACKED_HOSTS:
+                for idle in [name for name, other in _hosts.items() if other.is_idle()]:
+                    del _hosts[idle]
+            limiter = _hosts[host] = StageLimiter('fetch_host', FETCH_PER_HOST, FETCH_PER_HOST_QUEUE, action=f'fetch from {host}')
+    return limiter.slot()
+
+def admission_stats():
+    """
+    Report the load of every limited stage
+    
+    Returns:
+        dict: Limiter stats by stage, plus the busiest hosts under 'fetch_hosts'
+    """
+    stats = {stage: limiter.stats() for stage, limiter in _limiters.items()}
+    with _hosts_lock:
+        hosts = list(_hosts.items())
+    busy = [(host, limiter.stats()) for host, limiter in hosts if not limiter.is_idle()]
+    busy.sort(key=lambda item: item[1]['running'] + item[1]['queued'], reverse=True)
+    stats['fetch_hosts'] = dict(busy[:20])
+    return stats
@@ -0,0 +1,465 @@
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from and never change the page
+TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid')
+
+# Every persistent tier created in this process, so forked workers can reset them
+_stores = weakref.WeakSet()
+
+# Expired rows of a persistent tier are deleted after every this many writes from a process
+CACHE_PURGE_INTERVAL = int(os.environ.get('CACHE_PURGE_INTERVAL', 500))
+
+# Seconds a SQLite connection waits for another writer before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 30))
+
+# Seconds a worker's claim on a shared flight lasts, so a crashed worker's claim
+# lapses, and how often the other workers check whether it was released
+FLIGHT_LEASE = float(os.environ.get('FLIGHT_LEASE', 300))
+FLIGHT_POLL_INTERVAL = float(os.environ.get('FLIGHT_POLL_INTERVAL', 0.5))
+
+def normalize_url(url):
+    """
+    Normalize a URL so equivalent spellings share a cache entry
+    
+    Args:
+        url (str): URL as submitted by the user
+    
+    Returns:
+        str: Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    
+    # Drop default ports
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    
+    # Sort the query and strip tracking parameters; the fragment never reaches the server
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, urlencode(query), ''))
+
+def hash_bytes(data):
+    """
+    Hash raw content (e.g. an uploaded PDF) for use as a cache key
+    
+    Args:
+        data (bytes): Content to hash
+    
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def make_cache_key(source_key, target_language, **params):
+    """
+    Build a cache key from the source identity, target language and summary parameters
+    
+    Args:
+        source_key (str): Normalized URL or content hash of the source
+        target_language (str): Target language code
+        **params: Summary parameters that affect the result
+    
+    Returns:
+        str: Hex digest identifying the result
+    """
+    payload = json.dumps([source_key, target_language, params], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def make_result_id(result):
+    """
+    Derive a compact, URL-safe id from a result's contents
+    
+    Args:
+        result (dict): JSON-serializable result (any 'result_id' key is ignored)
+        
+    Returns:
+        str: 16-character id; identical results share an id
+    """
+    payload = json.dumps({key: value for key, value in result.items() if key != 'result_id'}, sort_keys=True)
+    digest = hashlib.sha256(payload.encode('utf-8')).digest()
+    return base64.urlsafe_b64encode(digest[:12]).decode('ascii')
+
+class SQLCacheStore:
+    """
+    Persistent cache tier backed by SQLAlchemy (SQLite locally, PostgreSQL in production)
+    
+    Expired rows are purged when the store is opened and then every
+    CACHE_PURGE_INTERVAL writes, so the table does not grow without bound.
+    
+    SQLite serializes all writers, so it only suits a single host with a few
+    workers: it is opened in WAL mode, where reads never wait for a write, and
+    writers queue for up to SQLITE_BUSY_TIMEOUT seconds instead of failing.
+    """
+    
+    def __init__(self, database_url, table_name='result_cache'):
+        from sqlalchemy import create_engine, event, MetaData, Table, Column, String, Text, Float
+        
+        if database_url.startswith('sqlite'):
+            self.engine = create_engine(database_url, pool_pre_ping=True, connect_args={'timeout': SQLITE_BUSY_TIMEOUT})
+            event.listen(self.engine, 'connect', _configure_sqlite)
+        else:
+            self.engine = create_engine(database_url, pool_pre_ping=True)
+        metadata = MetaData()
+        self.table = Table(
+            table_name, metadata,
+            Column('key', String(64), primary_key=True),
+            Column('value', Text, nullable=False),
+            Column('expires_at', Float, nullable=False, index=True),
+        )
+        metadata.create_all(self.engine)
+        _stores.add(self)
+        self._writes = itertools.count(1)
+        self.purge_expired()
+    
+    def get(self, key):
+        """Return (stored JSON value, expiry timestamp) for key, or None if missing or expired"""
+        from sqlalchemy import select
+        
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table.c.value, self.table.c.expires_at).where(self.table.c.key == key)
+            ).first()
+        if row is None or row.expires_at < time.time():
+            return None
+        return row.value, row.expires_at
+    
+    def set(self, key, value, expires_at):
+        """Insert or replace the stored JSON value for key"""
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.key == key))
+            conn.execute(self.table.insert().values(key=key, value=value, expires_at=expires_at))
+        if next(self._writes) % CACHE_PURGE_INTERVAL == 0:
+            try:
+                self.purge_expired()
+            except Exception as e:
+                logger.warning(f"Purging expired cache rows failed: {str(e)}")
+    
+    def claim(self, key, value, expires_at):
+        """Insert value for key unless an unexpired row holds key already, and return whether it was inserted"""
+        from sqlalchemy.exc import IntegrityError
+        
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.table.delete().where(self.table.c.key == key, self.table.c.expires_at < time.time()))
+                conn.execute(self.table.insert().values(key=key, value=value, expires_at=expires_at))
+        except IntegrityError:
+            return False
+        return True
+    
+    def delete(self, key):
+        """Delete the row for key, if there is one"""
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.key == key))
+    
+    def purge_expired(self):
+        """Delete expired rows"""
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.expires_at < time.time()))
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Switch a new SQLite connection to WAL mode with a busy timeout"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute(f'PRAGMA busy_timeout={int(SQLITE_BUSY_TIMEOUT * 1000)}')
+    cursor.close()
+
+def dispose_inherited_connections():
+    """
+    Drop the pooled database connections inherited from a parent process
+    
+    Call in every worker forked after the caches were created (e.g. from
+    gunicorn's post_fork hook) so parent and workers never share a connection.
+    The parent's connections are left open for the parent.
+    """
+    for store in list(_stores):
+        store.engine.dispose(close=False)
+
+class ResultCache:
+    """
+    Two-tier cache for processed results
+    
+    An in-process LRU tier with a TTL and entry/byte limits sits in front of an
+    optional persistent SQL tier shared by every worker.
+    """
+    
+    def __init__(self, ttl=3600, max_entries=1024, max_bytes=64 * 1024 * 1024, database_url=None, table_name='result_cache'):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'memory_hits': 0, 'persistent_hits': 0, 'evictions': 0}
+        
+        self.store = None
+        if database_url:
+            try:
+                self.store = SQLCacheStore(database_url, table_name)
+            except Exception as e:
+                logger.warning(f"Persistent result cache disabled: {str(e)}")
+    
+    def get(self, key):
+        """
+        Look up a cached result
+        
+        Args:
+            key (str): Cache key from make_cache_key
+        
+        Returns:
+            dict: The cached result, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at >= now:
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    self.counters['memory_hits'] += 1
+                    return json.loads(value)
+                self._remove(key)
+        
+        if self.store is not None:
+            try:
+                row = self.store.get(key)
+            except Exception as e:
+                logger.warning(f"Persistent result cache lookup failed: {str(e)}")
+                row = None
+            if row is not None:
+                # Keep the row's expiry so reading an entry never extends its life
+                value, expires_at = row
+                with self._lock:
+                    self._insert(key, value, expires_at)
+                    self.counters['hits'] += 1
+                    self.counters['persistent_hits'] += 1
+                return json.loads(value)
+        
+        with self._lock:
+            self.counters['misses'] += 1
+        return None
+    
+    def contains(self, key):
+        """
+        Check whether an unexpired entry exists, without counting a lookup
+        
+        Args:
+            key (str): Cache key
+        
+        Returns:
+            bool: True if either tier holds the entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.time():
+                return True
+        
+        if self.store is None:
+            return False
+        try:
+            row = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"Persistent result cache lookup failed: {str(e)}")
+            return False
+        if row is None:
+            return False
+        value, expires_at = row
+        with self._lock:
+            self._insert(key, value, expires_at)
+        return True
+    
+    def set(self, key, result):
+        """
+        Store a result in every tier
+        
+        Args:
+            key (str): Cache key from make_cache_key
+            result (dict): JSON-serializable result
+        """
+        value = json.dumps(result)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._insert(key, value, expires_at)
+        
+        if self.store is not None:
+            try:
+                self.store.set(key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"Persistent result cache write failed: {str(e)}")
+    
+    def stats(self):
+        """
+        Report cache counters
+        
+        Returns:
+            dict: Hit/miss/eviction counters plus current size and hit rate
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._size
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        """Drop every in-memory entry"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def _insert(self, key, value, expires_at):
+        # Caller holds the lock
+        if key in self._entries:
+            self._remove(key)
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (expires_at, size, value)
+        self._size += size
+        
+        # Evict least recently used entries until both limits hold
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.counters['evictions'] += 1
+    
+    def _remove(self, key):
+        # Caller holds the lock
+        expires_at, size, value = self._entries.pop(key)
+        self._size -= size
+
+class _Flight:
+    """A call in progress and, once it is done, its outcome"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces identical calls that are running at the same time
+    
+    While a call for a key is in flight, other callers with the same key wait
+    for it and share its result (or exception) instead of repeating the work.
+    Nothing is kept once the call returns; pair it with a cache for that.
+    
+    On its own this only coalesces calls within one process. Given a store
+    shared by every worker and a lookup into the cache the call fills, the one
+    call a process runs for a key first claims the key in the store: if another
+    worker holds it, this process waits for the claim to be released and then
+    takes that worker's result from the cache. A claim lapses after FLIGHT_LEASE
+    seconds, so a worker that dies mid-call does not hold up the others.
+    """
+    
+    def __init__(self, store=None, lookup=None, lease=FLIGHT_LEASE, poll_interval=FLIGHT_POLL_INTERVAL):
+        self.store = store
+        self.lookup = lookup
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.counters = {'calls': 0, 'shared': 0}
+    
+    def do(self, key, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs), unless a call for the same key is already running
+        
+        Args:
+            key: Hashable identity of the computation
+            func: Function computing the result
+            *args, **kwargs: Passed through to func
+        
+        Returns:
+            tuple: (The result, whether it came from another caller's call); a
+                shared result is the same object every waiting caller receives
+        """
+        with self._lock:
+            self.counters['calls'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.counters['shared'] += 1
+        
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        
+        try:
+            flight.result, shared = self._run_claimed(key, func, args, kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, shared
+    
+    def _run_claimed(self, key, func, args, kwargs):
+        """Run func holding the store's claim on key, or take the result of the worker holding it"""
+        if self.store is None:
+            return func(*args, **kwargs), False
+        
+        while True:
+            try:
+                # Recorded per process; gunicorn forks its workers after this object is created
+                owner = json.dumps({'host': socket.gethostname(), 'pid': os.getpid()})
+                if self.store.claim(key, owner, time.time() + self.lease):
+                    break
+                while self.store.get(key) is not None:
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                logger.warning(f"Shared flight claim failed, running the call here: {str(e)}")
+                return func(*args, **kwargs), False
+            
+            # The claim was released or lapsed; the result is cached unless that call failed
+            result = self.lookup(key)
+            if result is not None:
+                with self._lock:
+                    self.counters['shared'] += 1
+                return result, True
+        
+        try:
+            return func(*args, **kwargs), False
+        finally:
+            try:
+                self.store.delete(key)
+            except Exception as e:
+                # Left to lapse; the other workers find the cached result once it does
+                logger.warning(f"Releasing shared flight claim failed: {str(e)}")
+    
+    def stats(self):
+        """
+        Report coalescing counters
+        
+        Returns:
+            dict: Calls made, calls that shared another call's result, and keys in flight
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['in_flight'] = len(self._flights)
+        return stats
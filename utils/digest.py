@@ -0,0 +1,131 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from utils.scraper import fetch_page, FETCH_DEADLINE
+from utils.admission import admit
+from utils.summarizer import split_sentences, count_words, preprocess_text
+
+logger = logging.getLogger(__name__)
+
+# Most URLs accepted in one digest
+DIGEST_MAX_URLS = int(os.environ.get('DIGEST_MAX_URLS', 20))
+
+# Fetches in flight at once across all hosts, and per host
+DIGEST_FETCH_WORKERS = int(os.environ.get('DIGEST_FETCH_WORKERS', 16))
+DIGEST_PER_HOST = int(os.environ.get('DIGEST_PER_HOST', 2))
+
+# Seconds a single fetch may take once started, and all fetches of a digest together
+DIGEST_FETCH_TIMEOUT = float(os.environ.get('DIGEST_FETCH_TIMEOUT', FETCH_DEADLINE))
+DIGEST_DEADLINE = float(os.environ.get('DIGEST_DEADLINE', 30))
+
+# Sentences whose content words overlap an earlier sentence's this much (Jaccard) are dropped
+DIGEST_DUPLICATE_SIMILARITY = float(os.environ.get('DIGEST_DUPLICATE_SIMILARITY', 0.7))
+
+# fetch_page blocks, so the event loop runs it on these threads
+_executor = ThreadPoolExecutor(max_workers=DIGEST_FETCH_WORKERS, thread_name_prefix='digest-fetch')
+
+def _fetch_admitted(url, known, on_start):
+    """Fetch one page holding a slot of the shared fetch stage, like a single /process fetch"""
+    with admit('fetch'):
+        on_start()
+        return fetch_page(url, known)
+
+async def _fetch(url, known, host_limit):
+    """Fetch one page on the thread pool once its host has a free slot"""
+    loop = asyncio.get_running_loop()
+    started = asyncio.Event()
+    async with host_limit:
+        fetch = loop.run_in_executor(_executor, _fetch_admitted, url, known, lambda: loop.call_soon_threadsafe(started.set))
+        # The pool and the fetch stage are shared with other requests; time spent waiting
+        # for them counts against the digest deadline only, not against this fetch's timeout
+        waiting = asyncio.ensure_future(started.wait())
+        await asyncio.wait({fetch, waiting}, return_when=asyncio.FIRST_COMPLETED)
+        waiting.cancel()
+        try:
+            return await asyncio.wait_for(fetch, DIGEST_FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Fetch took longer than {DIGEST_FETCH_TIMEOUT:g} seconds")
+
+async def _fetch_all(urls, known):
+    host_limits = {}
+    tasks = []
+    for url, known_page in zip(urls, known):
+        host_limit = host_limits.setdefault(urlparse(url).netloc.lower(), asyncio.Semaphore(DIGEST_PER_HOST))
+        tasks.append(asyncio.ensure_future(_fetch(url, known_page, host_limit)))
+    
+    done, pending = await asyncio.wait(tasks, timeout=DIGEST_DEADLINE)
+    for task in pending:
+        task.cancel()
+    
+    results = []
+    for url, task in zip(urls, tasks):
+        if task in pending:
+            results.append(TimeoutError(f"Not fetched within the digest deadline of {DIGEST_DEADLINE:g} seconds"))
+        elif task.exception() is not None:
+            logger.warning(f"Failed to fetch {url}: {str(task.exception())}")
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results
+
+def fetch_pages(urls, known=None):
+    """
+    Fetch many pages concurrently
+    
+    Fetches run at most DIGEST_PER_HOST at a time per host and DIGEST_FETCH_WORKERS
+    overall, so the total time is close to that of the slowest host rather than
+    the sum of all fetches.
+    
+    Args:
+        urls (list): URLs to fetch
+        known (list): For each URL, the content hash and validators of an earlier
+            fetch (e.g. its earlier result, see fetch_page), or None (optional)
+    
+    Returns:
+        list: A FetchedPage, or the exception that stopped the fetch, for each URL in order
+    """
+    if not urls:
+        return []
+    return asyncio.run(_fetch_all(urls, known or [None] * len(urls)))
+
+def merge_summaries(summaries, similarity=DIGEST_DUPLICATE_SIMILARITY):
+    """
+    Split summaries into sentences, dropping sentences that repeat an earlier one
+    
+    A sentence repeats an earlier one when their content words overlap by at
+    least the given Jaccard similarity, so wire copies of the same story with
+    small edits are caught too.
+    
+    Args:
+        summaries (list): Summary texts, in digest order
+        similarity (float): Overlap from which a sentence counts as a repeat
+    
+    Returns:
+        tuple: (List of kept sentences for each summary, number of sentences dropped)
+    """
+    kept_words = []
+    kept_texts = set()
+    merged = []
+    dropped = 0
+    
+    for summary in summaries:
+        sentences = []
+        for sentence in split_sentences(summary or ''):
+            words = frozenset(count_words(preprocess_text(sentence)))
+            if words:
+                repeated = any(len(words & other) >= similarity * len(words | other) for other in kept_words)
+            else:
+                repeated = sentence in kept_texts
+            
+            if repeated:
+                dropped += 1
+                continue
+            if words:
+                kept_words.append(words)
+            kept_texts.add(sentence)
+            sentences.append(sentence)
+        merged.append(sentences)
+    
+    return merged, dropped
@@ -0,0 +1,214 @@
+import time
+import json
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Seconds between store reads while waiting on a job that runs in another process
+STORE_POLL_INTERVAL = 0.5
+
+# Attempts at writing a job's state to the shared store before giving up
+STORE_WRITE_ATTEMPTS = 3
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting to run"""
+
+class JobStateError(Exception):
+    """Raised when a job's state could not be written to the shared store"""
+
+class JobManager:
+    """
+    Runs background jobs on a bounded thread pool and tracks their progress
+    
+    Jobs run in the process that accepted them. With a store (an SQLCacheStore
+    shared by every worker), each change of a job is also written there, so any
+    worker can answer status requests; without one, status requests must reach
+    the accepting process (e.g. gunicorn with one worker and several threads).
+    
+    A job whose state cannot be shared would look unknown to the other workers,
+    so failed writes are not swallowed: submit() raises JobStateError, and a job
+    whose progress cannot be recorded fails with that error.
+    """
+    
+    def __init__(self, max_workers=4, max_pending=100, ttl=3600, store=None):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue a job
+        
+        Args:
+            func: Called as func(progress, *args, **kwargs); progress(stage, status, duration)
+                reports stage updates and the return value becomes the job result
+            *args, **kwargs: Passed through to func
+        
+        Returns:
+            str: The job id
+        
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+            JobStateError: If the job could not be written to the shared store
+        """
+        with self._lock:
+            self._purge_expired()
+            pending = sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise JobQueueFull('Too many jobs in progress, please try again shortly')
+            
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'stages': {},
+                'result': None,
+                'error': None,
+                'created_at': time.time(),
+                'finished_at': None,
+                'version': 0,
+            }
+            snapshot = self._snapshot(self._jobs[job_id])
+        
+        try:
+            self._publish(snapshot)
+        except JobStateError:
+            with self._lock:
+                del self._jobs[job_id]
+            raise
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+    
+    def get(self, job_id):
+        """
+        Get a snapshot of a job
+        
+        Args:
+            job_id (str): The job id
+        
+        Returns:
+            dict: Copy of the job state, or None if unknown or expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job:
+                return self._snapshot(job)
+        return self._load(job_id)
+    
+    def counts(self):
+        """
+        Count jobs by status
+        
+        Returns:
+            dict: Number of jobs per status
+        """
+        counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return counts
+    
+    def wait_for_change(self, job_id, version, timeout=15):
+        """
+        Block until a job changes past the given version
+        
+        Args:
+            job_id (str): The job id
+            version (int): Last version seen by the caller
+            timeout (float): Maximum seconds to wait
+        
+        Returns:
+            dict: Copy of the job state, or None if unknown or expired
+        """
+        with self._lock:
+            local = job_id in self._jobs
+        if not local:
+            # The job runs in another process: poll the shared store
+            deadline = time.monotonic() + timeout
+            job = self._load(job_id)
+            while job and job['version'] <= version and time.monotonic() < deadline:
+                time.sleep(STORE_POLL_INTERVAL)
+                job = self._load(job_id)
+            return job
+        
+        with self._lock:
+            self._changed.wait_for(
+                lambda: job_id not in self._jobs or self._jobs[job_id]['version'] > version,
+                timeout=timeout
+            )
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+    
+    def _run(self, job_id, func, args, kwargs):
+        def progress(stage, status, duration):
+            self._update(job_id, lambda job: job['stages'].__setitem__(stage, {
+                'status': status,
+                'duration_ms': round(duration * 1000, 1) if duration is not None else None,
+            }))
+        
+        try:
+            self._update(job_id, lambda job: job.update(status='running'))
+            result = func(progress, *args, **kwargs)
+            self._update(job_id, lambda job: job.update(status='done', result=result, finished_at=time.time()))
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            try:
+                self._update(job_id, lambda job: job.update(status='failed', error=str(e), finished_at=time.time()))
+            except JobStateError as state_error:
+                # Nobody is left to tell: the job stays failed in this process only
+                logger.error(f"Job {job_id} failed and its state could not be shared: {str(state_error)}")
+    
+    def _update(self, job_id, change):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            change(job)
+            job['version'] += 1
+            self._changed.notify_all()
+            snapshot = self._snapshot(job)
+        self._publish(snapshot)
+    
+    def _publish(self, snapshot):
+        """Write a job's state to the shared store, if there is one, retrying a few times"""
+        if self.store is None:
+            return
+        for attempt in range(1, STORE_WRITE_ATTEMPTS + 1):
+            try:
+                self.store.set(snapshot['id'], json.dumps(snapshot), time.time() + self.ttl)
+                return
+            except Exception as e:
+                logger.warning(f"Could not share the state of job {snapshot['id']} (attempt {attempt}): {str(e)}")
+                if attempt == STORE_WRITE_ATTEMPTS:
+                    raise JobStateError(f"Could not record the job's state: {str(e)}")
+                time.sleep(STORE_POLL_INTERVAL * attempt)
+    
+    def _load(self, job_id):
+        """Read a job's state from the shared store, or None"""
+        if self.store is None:
+            return None
+        try:
+            row = self.store.get(job_id)
+        except Exception as e:
+            logger.warning(f"Could not read the state of job {job_id}: {str(e)}")
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def _snapshot(self, job):
+        # Caller holds the lock
+        snapshot = dict(job)
+        snapshot['stages'] = {name: dict(stage) for name, stage in job['stages'].items()}
+        return snapshot
+    
+    def _purge_expired(self):
+        # Caller holds the lock
+        cutoff = time.time() - self.ttl
+        for job_id in [job_id for job_id, job in self._jobs.items() if job['finished_at'] and job['finished_at'] < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,71 @@
+# English word lists copied from spaCy 3.8.16 so the regex summarizer backend can
+# run without importing spaCy. Regenerate with:
+#   python -c "from spacy.lang.en.stop_words import STOP_WORDS; print(sorted(STOP_WORDS))"
+#   python -c "from spacy.lang.en.lex_attrs import _num_words, _ordinal_words; print(_num_words + _ordinal_words)"
+#   python -c "import spacy; print(sorted(k for k, v in spacy.blank('en').tokenizer.rules.items() if k.endswith('.') and len(v) == 1 and k.strip('.')))"
+
+# Stop words (spacy.lang.en.stop_words)
+STOP_WORDS = frozenset([
+    "'d", "'ll", "'m", "'re", "'s", "'ve", 'a', 'about', 'above', 'across', 'after',
+    'afterwards', 'again', 'against', 'all', 'almost', 'alone', 'along', 'already', 'also',
+    'although', 'always', 'am', 'among', 'amongst', 'amount', 'an', 'and', 'another', 'any',
+    'anyhow', 'anyone', 'anything', 'anyway', 'anywhere', 'are', 'around', 'as', 'at', 'back',
+    'be', 'became', 'because', 'become', 'becomes', 'becoming', 'been', 'before', 'beforehand',
+    'behind', 'being', 'below', 'beside', 'besides', 'between', 'beyond', 'both', 'bottom',
+    'but', 'by', 'ca', 'call', 'can', 'cannot', 'could', 'did', 'do', 'does', 'doing', 'done',
+    'down', 'due', 'during', 'each', 'eight', 'either', 'eleven', 'else', 'elsewhere', 'empty',
+    'enough', 'even', 'ever', 'every', 'everyone', 'everything', 'everywhere', 'except', 'few',
+    'fifteen', 'fifty', 'first', 'five', 'for', 'former', 'formerly', 'forty', 'four', 'from',
+    'front', 'full', 'further', 'get', 'give', 'go', 'had', 'has', 'have', 'he', 'hence', 'her',
+    'here', 'hereafter', 'hereby', 'herein', 'hereupon', 'hers', 'herself', 'him', 'himself',
+    'his', 'how', 'however', 'hundred', 'i', 'if', 'in', 'indeed', 'into', 'is', 'it', 'its',
+    'itself', 'just', 'keep', 'last', 'latter', 'latterly', 'least', 'less', 'made', 'make',
+    'many', 'may', 'me', 'meanwhile', 'might', 'mine', 'more', 'moreover', 'most', 'mostly',
+    'move', 'much', 'must', 'my', 'myself', "n't", 'name', 'namely', 'neither', 'never',
+    'nevertheless', 'next', 'nine', 'no', 'nobody', 'none', 'noone', 'nor', 'not', 'nothing',
+    'now', 'nowhere', 'n‘t', 'n’t', 'of', 'off', 'often', 'on', 'once', 'one', 'only', 'onto',
+    'or', 'other', 'others', 'otherwise', 'our', 'ours', 'ourselves', 'out', 'over', 'own',
+    'part', 'per', 'perhaps', 'please', 'put', 'quite', 'rather', 're', 'really', 'regarding',
+    'same', 'say', 'see', 'seem', 'seemed', 'seeming', 'seems', 'serious', 'several', 'she',
+    'should', 'show', 'side', 'since', 'six', 'sixty', 'so', 'some', 'somehow', 'someone',
+    'something', 'sometime', 'sometimes', 'somewhere', 'still', 'such', 'take', 'ten', 'than',
+    'that', 'the', 'their', 'them', 'themselves', 'then', 'thence', 'there', 'thereafter',
+    'thereby', 'therefore', 'therein', 'thereupon', 'these', 'they', 'third', 'this', 'those',
+    'though', 'three', 'through', 'throughout', 'thru', 'thus', 'to', 'together', 'too', 'top',
+    'toward', 'towards', 'twelve', 'twenty', 'two', 'under', 'unless', 'until', 'up', 'upon',
+    'us', 'used', 'using', 'various', 'very', 'via', 'was', 'we', 'well', 'were', 'what',
+    'whatever', 'when', 'whence', 'whenever', 'where', 'whereafter', 'whereas', 'whereby',
+    'wherein', 'whereupon', 'wherever', 'whether', 'which', 'while', 'whither', 'who',
+    'whoever', 'whole', 'whom', 'whose', 'why', 'will', 'with', 'within', 'without', 'would',
+    'yet', 'you', 'your', 'yours', 'yourself', 'yourselves', '‘d', '‘ll', '‘m', '‘re', '‘s',
+    '‘ve', '’d', '’ll', '’m', '’re', '’s', '’ve'
+])
+
+# Cardinal and ordinal number words, which spaCy's like_num treats as numbers (spacy.lang.en.lex_attrs)
+NUMBER_WORDS = frozenset([
+    'bazillion', 'bazillionth', 'billion', 'billionth', 'decillion', 'decillionth', 'eight',
+    'eighteen', 'eighteenth', 'eighth', 'eightieth', 'eighty', 'eleven', 'eleventh', 'fifteen',
+    'fifteenth', 'fifth', 'fiftieth', 'fifty', 'first', 'five', 'fortieth', 'forty', 'four',
+    'fourteen', 'fourteenth', 'fourth', 'gajillion', 'gajillionth', 'hundred', 'hundredth',
+    'million', 'millionth', 'nine', 'nineteen', 'nineteenth', 'ninetieth', 'ninety', 'ninth',
+    'nonillion', 'nonillionth', 'octillion', 'octillionth', 'one', 'quadrillion',
+    'quadrillionth', 'quintillion', 'quintillionth', 'second', 'septillion', 'septillionth',
+    'seven', 'seventeen', 'seventeenth', 'seventh', 'seventieth', 'seventy', 'sextillion',
+    'sextillionth', 'six', 'sixteen', 'sixteenth', 'sixth', 'sixtieth', 'sixty', 'ten', 'tenth',
+    'third', 'thirteen', 'thirteenth', 'thirtieth', 'thirty', 'thousand', 'thousandth', 'three',
+    'trillion', 'trillionth', 'twelfth', 'twelve', 'twentieth', 'twenty', 'two', 'zero'
+])
+
+# Abbreviations that spaCy's tokenizer keeps whole, so their period never ends a sentence
+ABBREVIATIONS = frozenset([
+    '._.', 'Adm.', 'Ak.', 'Ala.', 'Apr.', 'Ariz.', 'Ark.', 'Aug.', 'Bros.', 'Calif.', 'Co.',
+    'Colo.', 'Conn.', 'Corp.', 'D.C.', 'Dec.', 'Del.', 'Dr.', 'E.G.', 'E.g.', 'Feb.', 'Fla.',
+    'Ga.', 'Gen.', 'Gov.', 'I.E.', 'I.e.', 'Ia.', 'Id.', 'Ill.', 'Inc.', 'Ind.', 'Jan.', 'Jr.',
+    'Jul.', 'Jun.', 'Kan.', 'Kans.', 'Ky.', 'La.', 'Ltd.', 'Mar.', 'Mass.', 'Md.', 'Messrs.',
+    'Mich.', 'Minn.', 'Miss.', 'Mo.', 'Mont.', 'Mr.', 'Mrs.', 'Ms.', 'Mt.', 'N.C.', 'N.D.',
+    'N.H.', 'N.J.', 'N.M.', 'N.Y.', 'Neb.', 'Nebr.', 'Nev.', 'Nov.', 'Oct.', 'Okla.', 'Ore.',
+    'Pa.', 'Ph.D.', 'Prof.', 'Rep.', 'Rev.', 'S.C.', 'Sen.', 'Sep.', 'Sept.', 'St.', 'Tenn.',
+    'Va.', 'Wash.', 'Wis.', 'a.', 'a.m.', 'b.', 'c.', 'co.', 'd.', 'e.', 'e.g.', 'f.', 'g.',
+    'h.', 'i.', 'i.e.', 'j.', 'k.', 'l.', 'm.', 'n.', 'o.', 'p.', 'p.m.', 'q.', 'r.', 's.',
+    't.', 'u.', 'v.', 'v.s.', 'vs.', 'w.', 'x.', 'y.', 'z.', 'ä.', 'ö.', 'ü.'
+])
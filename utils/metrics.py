@@ -0,0 +1,181 @@
+import threading
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    """Format label pairs in Prometheus text syntax"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """Base class for labelled metrics"""
+    
+    metric_type = 'untyped'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, labels[name]) for name in self.labelnames)
+    
+    def samples(self):
+        """Yield (sample name, label pairs, value) tuples"""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, value
+    
+    def render(self):
+        """Render the metric in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+    
+    metric_type = 'counter'
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def set(self, value, **labels):
+        """Mirror a running total kept by another component"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+    
+    metric_type = 'gauge'
+    
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+    
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+    
+    metric_type = 'histogram'
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+    
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+    
+    def samples(self):
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", key + (('le', _format_value(bound)),), count
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, counts[-1]
+
+class Registry:
+    """Collection of metrics rendered together for /metrics"""
+    
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._lock = threading.Lock()
+    
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def add_collector(self, collect):
+        """
+        Register a callback that refreshes metrics from other components right before rendering
+        
+        Args:
+            collect: Callable taking no arguments
+        """
+        with self._lock:
+            self._collectors.append(collect)
+    
+    def render(self):
+        """
+        Render every metric in Prometheus text exposition format
+        
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics)
+        for collect in collectors:
+            collect()
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+# Metrics of this process
+REGISTRY = Registry()
+
+STAGE_LATENCY = REGISTRY.histogram(
+    'pipeline_stage_duration_seconds', 'Time spent in each pipeline stage', ['stage']
+)
+STAGE_ERRORS = REGISTRY.counter(
+    'pipeline_stage_errors_total', 'Pipeline stages that raised an error', ['stage']
+)
+ADMISSION_IN_PROGRESS = REGISTRY.gauge(
+    'admission_in_progress', 'Work currently holding a slot of a limited stage', ['stage']
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    'admission_queue_depth', 'Work waiting for a slot of a limited stage', ['stage']
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    'admission_wait_seconds', 'Time spent waiting for a slot of a limited stage', ['stage']
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    'admission_rejected_total', 'Work turned away by a limited stage', ['stage', 'reason']
+)
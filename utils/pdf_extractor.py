@@ -1,39 +1,213 @@
+import hashlib
 import logging
+import multiprocessing
 import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager, closing
 import PyPDF2
 from werkzeug.utils import secure_filename
+from utils.pools import new_process_pool
 
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(pdf_file):
+# Maximum number of pages accepted per PDF
+MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 500))
+
+# Documents with at least this many pages are extracted in parallel
+PARALLEL_PAGE_THRESHOLD = int(os.environ.get('PDF_PARALLEL_PAGE_THRESHOLD', 40))
+
+# Worker processes used for parallel extraction (gunicorn.conf.py divides the CPUs between its workers)
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', os.cpu_count() or 1))
+
+# Sentence ends counted for early stopping: terminal punctuation, closing quotes/brackets, then whitespace
+SENTENCE_END = re.compile(r'[.!?]+["\'\u201d\u2019)\]]*\s')
+
+# Page ranges like "3", "2-10" or "5-" (1-based, inclusive)
+PAGE_RANGE = re.compile(r'^\s*(\d+)\s*(?:(-)\s*(\d*)\s*)?$')
+
+class PageRangeError(ValueError):
+    """Raised when a requested page range does not exist in the PDF"""
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    """Create the shared extraction process pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = new_process_pool(PDF_WORKERS)
+        return _pool
+
+def _extract_page_range(path, start, end):
+    """
+    Extract the text of a range of pages (runs in a worker process)
+    
+    Args:
+        path (str): Path of the PDF file
+        start (int): First page index
+        end (int): Page index after the last page
+    
+    Returns:
+        list: Text of each page
+    """
+    reader = PyPDF2.PdfReader(path)
+    return [reader.pages[page_num].extract_text() or '' for page_num in range(start, end)]
+
+@contextmanager
+def _pdf_path(pdf_file):
+    """
+    Get a filesystem path for the PDF so worker processes can open it
+    
+    Uses the file's own path when it has one, otherwise spools it to a temporary file.
+    """
+    name = getattr(pdf_file, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+    
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    try:
+        with os.fdopen(fd, 'wb') as spooled:
+            pdf_file.seek(0)
+            shutil.copyfileobj(pdf_file, spooled)
+        yield path
+    finally:
+        os.unlink(path)
+
+class SpooledUpload:
+    """
+    Temporary file that hashes everything written to it
+    
+    The app hands one to Werkzeug as the destination of each PDF upload, so the
+    upload is written to disk and hashed once, as the request body is parsed,
+    and never held in memory as a whole. Reading, seeking and closing go to the
+    underlying named temporary file, which is removed once closed; the file
+    outlives the request, so background jobs can still read it.
+    """
+    
+    def __init__(self, directory=None):
+        self._file = tempfile.NamedTemporaryFile(suffix='.pdf', dir=directory)
+        self._digest = hashlib.sha256()
+        self.filename = None
+    
+    def write(self, data):
+        self._digest.update(data)
+        return self._file.write(data)
+    
+    def hexdigest(self):
+        """Hex SHA-256 digest of everything written so far"""
+        return self._digest.hexdigest()
+    
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+def parse_page_range(value):
+    """
+    Parse a page range such as "3", "2-10" or "5-"
+    
+    Args:
+        value (str): Page range, 1-based and inclusive
+    
+    Returns:
+        tuple: (First page, last page or None for the end of the document)
+    
+    Raises:
+        ValueError: If the range is malformed or empty
+    """
+    match = PAGE_RANGE.match(value)
+    if not match:
+        raise ValueError(f"Invalid page range: {value}")
+    first = int(match.group(1))
+    last = int(match.group(3)) if match.group(3) else (None if match.group(2) else first)
+    if first < 1 or (last is not None and last < first):
+        raise ValueError(f"Invalid page range: {value}")
+    return first, last
+
+def iter_pdf_pages(pdf_file, max_pages=MAX_PAGES, page_range=None):
+    """
+    Extract text from a PDF page by page
+    
+    Small documents are read in this process; large ones are split into page
+    ranges extracted in parallel by a process pool. Pages are yielded in order,
+    and closing the generator early cancels the ranges not yet started.
+    
+    Args:
+        pdf_file: The PDF file object
+        max_pages (int): Maximum number of pages extracted
+        page_range (tuple): (First page, last page or None), 1-based and inclusive (optional)
+    
+    Yields:
+        str: Text of each page
+    
+    Raises:
+        PageRangeError: If the page range starts past the end of the document
+    """
+    reader = PyPDF2.PdfReader(pdf_file)
+    num_pages = len(reader.pages)
+    
+    start, end = 0, num_pages
+    if page_range:
+        first, last = page_range
+        if first > num_pages:
+            raise PageRangeError(f"The PDF only has {num_pages} pages")
+        start, end = first - 1, min(last or num_pages, num_pages)
+    
+    # Check page limit
+    if end - start > max_pages:
+        raise ValueError(f"PDF exceeds the {max_pages}-page limit")
+    
+    # Worker processes (e.g. bulk summarization) already run one per CPU, so they never start a nested pool
+    if end - start < PARALLEL_PAGE_THRESHOLD or PDF_WORKERS <= 1 or multiprocessing.parent_process() is not None:
+        for page_num in range(start, end):
+            yield reader.pages[page_num].extract_text() or ''
+        return
+    
+    # A few page ranges per worker keeps the pool busy while results stream back in order
+    chunk_size = max(8, -(-(end - start) // (PDF_WORKERS * 2)))
+    starts = list(range(start, end, chunk_size))
+    ends = [min(chunk_start + chunk_size, end) for chunk_start in starts]
+    
+    with _pdf_path(pdf_file) as path:
+        for page_texts in _get_pool().map(_extract_page_range, [path] * len(starts), starts, ends):
+            yield from page_texts
+
+def extract_text_from_pdf(pdf_file, page_range=None, stop_after_sentences=None):
     """
     Extract text content from a PDF file
     
     Args:
         pdf_file: The uploaded PDF file object
-        
+        page_range (tuple): (First page, last page or None), 1-based and inclusive (optional)
+        stop_after_sentences (int): Stop after the page on which this many sentences
+            have been collected, instead of reading to the end (optional)
+    
     Returns:
-        tuple: (Extracted text content, number of pages, filename)
+        tuple: (Extracted text content, number of pages extracted, filename)
+    
+    Raises:
+        PageRangeError: If the page range starts past the end of the document
     """
     try:
-        # Get the original filename
-        original_filename = secure_filename(pdf_file.filename)
-        
-        # Create PDF reader object
-        reader = PyPDF2.PdfReader(pdf_file)
+        # Get the original filename (uploads carry .filename, plain file objects .name)
+        original_filename = secure_filename(os.path.basename(getattr(pdf_file, 'filename', None) or getattr(pdf_file, 'name', '')))
         
-        # Get number of pages
-        num_pages = len(reader.pages)
-        
-        # Check page limit (50 pages)
-        if num_pages > 50:
-            raise ValueError("PDF exceeds the 50-page limit")
-        
-        # Extract text from all pages
-        text_content = ""
-        for page_num in range(num_pages):
-            page = reader.pages[page_num]
-            text_content += page.extract_text()
+        # Extract text page by page, joined once at the end
+        page_texts = []
+        num_sentences = 0
+        with closing(iter_pdf_pages(pdf_file, page_range=page_range)) as pages:
+            for page_text in pages:
+                page_texts.append(page_text)
+                if stop_after_sentences:
+                    num_sentences += len(SENTENCE_END.findall(page_text))
+                    if num_sentences >= stop_after_sentences:
+                        logger.debug(f"Stopped after {len(page_texts)} pages with {num_sentences} sentences")
+                        break
+        num_pages = len(page_texts)
+        text_content = ''.join(page_texts)
         
         if not text_content or len(text_content.strip()) < 50:
             raise ValueError("Could not extract meaningful content from the PDF")
@@ -41,6 +215,9 @@ def extract_text_from_pdf(pdf_file):
         logger.debug(f"Extracted {num_pages} pages from PDF: {original_filename}")
         return text_content, num_pages, original_filename
     
+    except PageRangeError:
+        raise
+    
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
-        raise Exception(f"Failed to extract PDF content: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to extract PDF content: {str(e)}")
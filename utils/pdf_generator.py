@@ -1,14 +1,22 @@
-import tempfile
-import os
+import hashlib
+import json
 import logging
+from functools import lru_cache
 from fpdf import FPDF
 from datetime import datetime
 from utils.translator import get_language_name
 
 logger = logging.getLogger(__name__)
 
+# Number of rendered PDFs kept in memory, keyed by their inputs
+PDF_CACHE_SIZE = 64
+
 class ArticlePDF(FPDF):
     """Custom PDF class for article summary"""
+    def __init__(self, generated_on):
+        super().__init__()
+        self.generated_on = generated_on
+    
     def header(self):
         # Set font
         self.set_font('Arial', 'B', 12)
@@ -25,12 +33,36 @@ class ArticlePDF(FPDF):
         # Page number
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
         # Date
-        self.cell(0, 10, datetime.now().strftime('%Y-%m-%d %H:%M'), 0, 0, 'R')
+        self.cell(0, 10, self.generated_on, 0, 0, 'R')
+
+def pdf_etag(original_url, summary, translated_summary=None, target_language=None, reading_time=None, source_type=None):
+    """
+    Compute a deterministic ETag for the PDF of a summary
+    
+    Only the generation date can differ between PDFs with the same ETag, so it is
+    meant to be sent as a weak validator.
+    
+    Args:
+        original_url (str): URL of the original article or PDF filename
+        summary (str): Original summary text
+        translated_summary (str): Translated summary text (optional)
+        target_language (str): Target language code (optional)
+        reading_time (str): Estimated reading time (optional)
+        source_type (str): Type of source ('url' or 'pdf')
+    
+    Returns:
+        str: Hex digest identifying the PDF contents
+    """
+    payload = json.dumps([original_url, summary, translated_summary, target_language, reading_time, source_type])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
 def generate_pdf(original_url, summary, translated_summary=None, target_language=None, reading_time=None, source_type=None):
     """
     Generate a PDF with the original and translated summaries
     
+    The PDF is rendered in memory; identical inputs are rendered once a day and
+    then served from an in-process cache.
+    
     Args:
         original_url (str): URL of the original article or PDF filename
         summary (str): Original summary text
@@ -38,77 +70,88 @@ def generate_pdf(original_url, summary, translated_summary=None, target_language
         target_language (str): Target language code (optional)
         reading_time (str): Estimated reading time (optional)
         source_type (str): Type of source ('url' or 'pdf')
-        
+    
     Returns:
-        str: Path to the generated PDF file
+        bytes: The generated PDF document
     """
     try:
-        # Create a temporary file for the PDF
-        fd, path = tempfile.mkstemp(suffix='.pdf')
-        os.close(fd)  # Close file descriptor
-        
-        # Create PDF object
-        pdf = ArticlePDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-        
-        # Set fonts
-        pdf.set_font('Arial', 'B', 16)
-        
-        # Title
-        title = 'Article Summary'
-        if source_type == 'pdf':
-            title = 'PDF Document Summary'
-        pdf.cell(0, 10, title, 0, 1, 'C')
-        pdf.ln(5)
-        
-        # Source information
-        pdf.set_font('Arial', '', 10)
-        source_label = "Source URL:" if source_type == 'url' else "Source File:"
-        pdf.multi_cell(0, 5, f"{source_label} {original_url}")
+        # The date is part of the cache key, so a cached PDF never shows an earlier day
+        generated_on = datetime.now().strftime('%Y-%m-%d')
+        return _render_pdf(original_url, summary, translated_summary, target_language, reading_time, source_type, generated_on)
+    
+    except Exception as e:
+        logger.error(f"Error generating PDF: {str(e)}")
+        raise Exception(f"Failed to generate PDF: {str(e)}")
+
+@lru_cache(maxsize=PDF_CACHE_SIZE)
+def _render_pdf(original_url, summary, translated_summary, target_language, reading_time, source_type, generated_on):
+    """
+    Render the summary PDF in memory
+    
+    Args:
+        Same as generate_pdf, plus generated_on (str), the date printed on the PDF
+    
+    Returns:
+        bytes: The generated PDF document
+    """
+    # Create PDF object
+    pdf = ArticlePDF(generated_on)
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    
+    # Set fonts
+    pdf.set_font('Arial', 'B', 16)
+    
+    # Title
+    title = 'Article Summary'
+    if source_type == 'pdf':
+        title = 'PDF Document Summary'
+    pdf.cell(0, 10, title, 0, 1, 'C')
+    pdf.ln(5)
+    
+    # Source information
+    pdf.set_font('Arial', '', 10)
+    source_label = "Source URL:" if source_type == 'url' else "Source File:"
+    pdf.multi_cell(0, 5, f"{source_label} {original_url}")
+    pdf.ln(5)
+    
+    # Date and time
+    pdf.cell(0, 5, f"Generated on: {generated_on}")
+    pdf.ln(10)
+    
+    # Original summary section
+    pdf.set_font('Arial', 'B', 14)
+    pdf.cell(0, 10, 'Summary (English)', 0, 1)
+    
+    if reading_time:
+        pdf.set_font('Arial', 'I', 10)
+        pdf.cell(0, 5, f"Estimated reading time: {reading_time}")
         pdf.ln(5)
+    
+    # Original summary content
+    pdf.set_font('Arial', '', 11)
+    pdf.multi_cell(0, 5, summary)
+    pdf.ln(10)
+    
+    # Translated summary section (if provided)
+    if translated_summary and target_language and target_language != 'en':
+        language_name = get_language_name(target_language)
         
-        # Date and time
-        pdf.cell(0, 5, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        pdf.ln(10)
-        
-        # Original summary section
         pdf.set_font('Arial', 'B', 14)
-        pdf.cell(0, 10, 'Summary (English)', 0, 1)
+        pdf.cell(0, 10, f'Summary ({language_name})', 0, 1)
         
+        # Translated reading time
         if reading_time:
             pdf.set_font('Arial', 'I', 10)
             pdf.cell(0, 5, f"Estimated reading time: {reading_time}")
             pdf.ln(5)
         
-        # Original summary content
+        # Translated summary content
         pdf.set_font('Arial', '', 11)
-        pdf.multi_cell(0, 5, summary)
-        pdf.ln(10)
-        
-        # Translated summary section (if provided)
-        if translated_summary and target_language and target_language != 'en':
-            language_name = get_language_name(target_language)
-            
-            pdf.set_font('Arial', 'B', 14)
-            pdf.cell(0, 10, f'Summary ({language_name})', 0, 1)
-            
-            # Translated reading time
-            if reading_time:
-                pdf.set_font('Arial', 'I', 10)
-                pdf.cell(0, 5, f"Estimated reading time: {reading_time}")
-                pdf.ln(5)
-            
-            # Translated summary content
-            pdf.set_font('Arial', '', 11)
-            pdf.multi_cell(0, 5, translated_summary)
-        
-        # Save the PDF to the temporary file
-        pdf.output(path)
-        
-        logger.debug(f"PDF generated: {path}")
-        return path
+        pdf.multi_cell(0, 5, translated_summary)
     
-    except Exception as e:
-        logger.error(f"Error generating PDF: {str(e)}")
-        raise Exception(f"Failed to generate PDF: {str(e)}")
+    # Render the PDF in memory (fpdf builds the document as a latin-1 string)
+    pdf_bytes = pdf.output(dest='S').encode('latin-1')
+    
+    logger.debug(f"PDF generated: {len(pdf_bytes)} bytes")
+    return pdf_bytes
@@ -0,0 +1,188 @@
+import time
+import logging
+from contextlib import contextmanager, nullcontext
+from utils.metrics import STAGE_LATENCY, STAGE_ERRORS
+from utils.admission import admit, Overloaded
+from utils.scraper import fetch_page, extract_content_from_html
+from utils.summarizer import summarize_text, calculate_reading_time
+from utils.translator import translate_text
+from utils.pdf_extractor import extract_text_from_pdf, PageRangeError
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in the order they run
+STAGES = ('fetch', 'extract', 'summarize', 'translate')
+
+class PipelineError(Exception):
+    """Raised when the input cannot be processed and the message should be shown to the user"""
+
+class StageTimer:
+    """
+    Records the duration of each pipeline stage
+    
+    Every stage is also observed in the stage latency/error metrics, and
+    progress is reported to an optional callback. Stages with an admission
+    limit (see utils.admission) first wait for a free slot; that wait is not
+    part of the stage's duration.
+    """
+    
+    def __init__(self, on_stage=None):
+        self.on_stage = on_stage
+        self.spans = []  # (stage name, duration in seconds)
+    
+    @contextmanager
+    def stage(self, name, admission=True):
+        """
+        Time a stage
+        
+        Args:
+            name (str): Stage name
+            admission (bool): Hold a slot of the stage's admission limit while it runs;
+                pass False when the block admits its own pieces of work
+        
+        The callback, if any, is called as on_stage(name, status, duration) with
+        status 'running' when the stage starts and 'done' or 'failed' when it ends.
+        
+        Raises:
+            Overloaded: If the stage is saturated; the block does not run
+        """
+        with admit(name) if admission else nullcontext():
+            if self.on_stage:
+                self.on_stage(name, 'running', None)
+            start = time.perf_counter()
+            try:
+                yield
+            except Exception:
+                duration = time.perf_counter() - start
+                self.spans.append((name, duration))
+                STAGE_LATENCY.observe(duration, stage=name)
+                STAGE_ERRORS.inc(stage=name)
+                if self.on_stage:
+                    self.on_stage(name, 'failed', duration)
+                raise
+            duration = time.perf_counter() - start
+            self.spans.append((name, duration))
+            STAGE_LATENCY.observe(duration, stage=name)
+            if self.on_stage:
+                self.on_stage(name, 'done', duration)
+    
+    def skip(self, name):
+        """Report a stage that does not apply to this input"""
+        if self.on_stage:
+            self.on_stage(name, 'skipped', None)
+    
+    def server_timing(self):
+        """
+        Format the recorded spans as a Server-Timing header value
+        
+        Returns:
+            str: e.g. 'fetch;dur=120.4, extract;dur=35.2'
+        """
+        return ', '.join(f"{name};dur={duration * 1000:.1f}" for name, duration in self.spans)
+
+def run_pipeline(source_type, source, target_language='en', summary_options=None, timer=None, previous=None, page=None,
+                 extract_options=None):
+    """
+    Fetch, extract, summarize and translate a single source
+    
+    Args:
+        source_type (str): 'url', 'pdf' or 'text'
+        source: The URL, a file-like PDF object with a filename, or the text itself
+        target_language (str): Target language code (default: 'en')
+        summary_options (dict): Keyword arguments for summarize_text (optional)
+        timer (StageTimer): Records stage timings (optional)
+        previous (dict): An earlier result for the same URL, language and options; it is
+            returned as is if the page has not changed since (optional)
+        page (FetchedPage): The URL's page, if it has already been fetched (optional)
+        extract_options (dict): Keyword arguments for extract_text_from_pdf, e.g. a page range (optional)
+    
+    Returns:
+        dict: The processed result, as rendered by result.html
+    """
+    timer = timer or StageTimer()
+    summary_options = summary_options or {}
+    images = []
+    content_hash = None
+    validators = None
+    
+    if source_type == 'url':
+        source_name = source
+        
+        # Fetch the page, then extract article content and images
+        logger.debug(f"Extracting content from URL: {source}")
+        try:
+            if page is None:
+                with timer.stage('fetch'):
+                    page = fetch_page(source, previous)
+            content_hash = page.content_hash
+            validators = page.validators
+            
+            # Unchanged page (304 or same bytes): the earlier result still holds, so skip the remaining stages
+            if previous and content_hash == previous.get('content_hash'):
+                logger.debug(f"Content unchanged since the previous result: {source}")
+                for stage in STAGES[STAGES.index('extract'):]:
+                    timer.skip(stage)
+                return dict(previous, validators=validators)
+            
+            with timer.stage('extract'):
+                article_content, images = extract_content_from_html(page.html, source)
+        except Overloaded:
+            raise
+        except Exception as e:
+            logger.error(f"Error extracting content from URL {source}: {str(e)}")
+            raise Exception(f"Failed to extract content: {str(e)}")
+        
+        if not article_content or len(article_content.strip()) < 50:
+            raise PipelineError('Could not extract meaningful content from the provided URL')
+    
+    elif source_type == 'text':
+        # Text submitted directly needs neither fetching nor extraction
+        timer.skip('fetch')
+        timer.skip('extract')
+        source_name = 'Submitted text'
+        article_content = source
+        
+        if len(article_content.strip()) < 50:
+            raise PipelineError('Please provide at least 50 characters of text')
+    
+    else:
+        # Extract text from PDF
+        timer.skip('fetch')
+        logger.debug(f"Extracting content from PDF: {source.filename}")
+        try:
+            with timer.stage('extract'):
+                article_content, num_pages, source_name = extract_text_from_pdf(source, **(extract_options or {}))
+        except PageRangeError as e:
+            raise PipelineError(str(e))
+    
+    # Generate summary
+    logger.debug("Generating summary")
+    with timer.stage('summarize'):
+        summary = summarize_text(article_content, **summary_options)
+        reading_time = calculate_reading_time(summary)
+    
+    # Translate summary if requested and not already in the target language
+    if target_language != 'en':
+        logger.debug(f"Translating summary to {target_language}")
+        with timer.stage('translate'):
+            translated_summary = translate_text(summary, target_language)
+            translated_reading_time = calculate_reading_time(translated_summary)
+    else:
+        timer.skip('translate')
+        translated_summary = summary
+        translated_reading_time = reading_time
+    
+    return {
+        'source_type': source_type,
+        'source_name': source_name,
+        'original_url': source if source_type == 'url' else None,
+        'article_content': article_content[:1000] + '...' if len(article_content) > 1000 else article_content,
+        'summary': summary,
+        'translated_summary': translated_summary,
+        'target_language': target_language,
+        'reading_time': reading_time,
+        'translated_reading_time': translated_reading_time,
+        'images': images if source_type == 'url' else [],
+        'content_hash': content_hash,
+        'validators': validators
+    }
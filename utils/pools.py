@@ -0,0 +1,26 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Pools are created lazily inside threaded server workers. A forked child would
+# inherit locks held by the parent's other threads (logging, caches, database
+# pools) and could deadlock on them, so workers are started by a forkserver, a
+# clean single-threaded process, or spawned where forkserver is unavailable.
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def new_process_pool(max_workers, preload=()):
+    """
+    Create a process pool that is safe to start from a multi-threaded process
+    
+    Args:
+        max_workers (int): Number of worker processes
+        preload (tuple): Modules the forkserver imports once, so every worker
+            forked from it starts with them loaded (e.g. the NLP model)
+    
+    Returns:
+        ProcessPoolExecutor: The pool
+    """
+    context = multiprocessing.get_context(START_METHOD)
+    if START_METHOD == 'forkserver' and preload:
+        # Only takes effect if the forkserver is not running yet
+        context.set_forkserver_preload(list(preload))
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
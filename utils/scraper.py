@@ -1,131 +1,405 @@
+import os
+import time
+import codecs
+import hashlib
 import logging
+from collections import namedtuple
 import requests
-from bs4 import BeautifulSoup
+import charset_normalizer
+from bs4 import BeautifulSoup, Tag
 import trafilatura
 from urllib.parse import urlparse, urljoin
 import re
+from utils.admission import admit_host
 
 logger = logging.getLogger(__name__)
 
-def extract_article_content(url):
+# Headers for requests
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+REQUEST_TIMEOUT = 10
+
+# Limits on a single page download: total size (after decompression) and total time
+FETCH_MAX_BYTES = int(os.environ.get('FETCH_MAX_BYTES', 10 * 1024 * 1024))
+FETCH_DEADLINE = float(os.environ.get('FETCH_DEADLINE', 20))
+FETCH_CHUNK_SIZE = 64 * 1024
+
+# Use lxml's C parser when it is installed; html.parser is pure Python
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Elements dropped before the fallback extractor looks for the article
+BOILERPLATE_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header'])
+
+# Div classes that usually hold the article body
+CONTENT_CLASSES = frozenset(['content', 'article', 'post', 'entry', 'main-content'])
+
+# Image URLs that are most likely icons, ads or trackers rather than article images
+IMAGE_FILTER = re.compile(r'(icon|logo|avatar|banner|ad|pixel|tracking)', re.IGNORECASE)
+
+PageScan = namedtuple('PageScan', ['article', 'content_divs', 'densest_div', 'images', 'og_image', 'spans', 'boilerplate'])
+
+# Content types worth extracting; anything else is rejected from the headers alone
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# A charset declared in a <meta> tag must appear within the first 1024 bytes (HTML spec prescan)
+META_PRESCAN_BYTES = 1024
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_:.+-]+)', re.IGNORECASE)
+CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+# Shared session so connections to the same host are pooled and kept alive
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
+# html is None when the server answered 304 Not Modified; validators holds the
+# page's ETag and Last-Modified date for revalidating it later
+FetchedPage = namedtuple('FetchedPage', ['html', 'content_hash', 'not_modified', 'validators'])
+
+def _check_response_headers(response):
+    """Reject non-HTML or oversized responses before reading the body"""
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and content_type not in HTML_CONTENT_TYPES:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    
+    content_length = response.headers.get('Content-Length')
+    if content_length and content_length.isdigit() and int(content_length) > FETCH_MAX_BYTES:
+        raise ValueError(f"Page is larger than the {FETCH_MAX_BYTES}-byte limit")
+
+def _known_encoding(name):
+    """Return the codec name if Python knows the encoding, otherwise None"""
+    try:
+        return codecs.lookup(name).name
+    except (LookupError, TypeError):
+        return None
+
+def _sniff_encoding(content_type, head):
     """
-    Extract the main content from a given URL.
-    Uses trafilatura first, then falls back to BeautifulSoup if needed.
+    Work out the character encoding of a page
+    
+    requests falls back to ISO-8859-1 for any text/* response without a charset,
+    which turns UTF-8 pages into mojibake, so its guess is not used. The charset
+    comes from the Content-Type header, then a byte order mark, then a <meta>
+    tag, and only then from the bytes themselves.
     
     Args:
-        url (str): URL of the article to extract
+        content_type (str): Content-Type header of the response
+        head (bytes): The start of the body
         
     Returns:
-        tuple: (Extracted article text content, List of image URLs)
+        str: Codec name to decode the body with
     """
+    match = CHARSET_PARAM.search(content_type or '')
+    encoding = match and _known_encoding(match.group(1))
+    if encoding:
+        return encoding
+    
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    
+    match = META_CHARSET.search(head[:META_PRESCAN_BYTES])
+    encoding = match and _known_encoding(match.group(1).decode('ascii'))
+    if encoding:
+        # Pages labelled UTF-16 in a meta tag are ASCII-compatible in practice, so the label is wrong
+        return 'utf-8' if encoding.startswith('utf-16') else encoding
+    
     try:
-        # Headers for requests
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        # A multi-byte sequence may be cut off at the end of the head
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        guess = charset_normalizer.from_bytes(head).best()
+        return (guess and _known_encoding(guess.encoding)) or 'utf-8'
+
+def _read_body(response, deadline):
+    """
+    Stream the response body, decoding and hashing it chunk by chunk
+    
+    The encoding is settled once the first META_PRESCAN_BYTES have arrived,
+    which is where a <meta> charset has to be; the rest is decoded as it comes.
+    
+    Args:
+        response (requests.Response): Response opened with stream=True
+        deadline (float): time.monotonic() value by which the download must finish
         
-        # Get the page content
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+    Returns:
+        tuple: (Decoded text, hex SHA-256 digest of the body)
+    """
+    content_type = response.headers.get('Content-Type')
+    digest = hashlib.sha256()
+    decoder = None
+    head = b''
+    pieces = []
+    size = 0
+    
+    while True:
+        # read1 returns whatever has arrived, so a slowly trickling server cannot outlast the deadline
+        chunk = response.raw.read1(FETCH_CHUNK_SIZE, decode_content=True)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > FETCH_MAX_BYTES:
+            raise ValueError(f"Page is larger than the {FETCH_MAX_BYTES}-byte limit")
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Page download took longer than {FETCH_DEADLINE:g} seconds")
+        digest.update(chunk)
         
-        # Parse with BeautifulSoup for image extraction
-        soup = BeautifulSoup(response.text, 'html.parser')
+        if decoder is None:
+            head += chunk
+            if len(head) < META_PRESCAN_BYTES:
+                continue
+            decoder = codecs.getincrementaldecoder(_sniff_encoding(content_type, head))(errors='replace')
+            chunk, head = head, b''
+        pieces.append(decoder.decode(chunk))
+    
+    if decoder is None:
+        # The whole page was shorter than the prescan window
+        decoder = codecs.getincrementaldecoder(_sniff_encoding(content_type, head))(errors='replace')
+    pieces.append(decoder.decode(head, final=True))
+    return ''.join(pieces), digest.hexdigest()
+
+def fetch_page(url, known=None):
+    """
+    Download a page, revalidating it if its content is already known
+    
+    The page comes back with its content hash and validators (ETag and
+    Last-Modified date), which the caller keeps with its result. When the caller
+    passes those of a version it still holds, the request is made conditional
+    (If-None-Match / If-Modified-Since), so an unchanged page costs a 304 instead
+    of a full download. Keeping the validators with the result, rather than in
+    this process, lets any worker revalidate a page another one fetched.
+    
+    The body is streamed: non-HTML content types and oversized responses are
+    rejected before it is read, and the download is capped at FETCH_MAX_BYTES
+    and FETCH_DEADLINE seconds. At most FETCH_PER_HOST downloads from the same
+    host run at once in this process.
+    
+    Args:
+        url (str): URL of the page to fetch
+        known (dict): 'content_hash' and 'validators' of the version the caller
+            already has, e.g. an earlier pipeline result (optional)
         
-        # Extract images
-        images = []
+    Returns:
+        FetchedPage: The decoded HTML (None on a 304), its content hash, whether
+            the server reported it as not modified, and its validators
+    """
+    known_hash = known and known.get('content_hash')
+    validators = (known and known.get('validators')) or {}
+    
+    headers = {}
+    if known_hash:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
+    with admit_host(url):
+        deadline = time.monotonic() + FETCH_DEADLINE
+        with _session.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            if response.status_code == 304 and headers:
+                logger.debug(f"Page not modified: {url}")
+                return FetchedPage(None, known_hash, True, validators)
+            response.raise_for_status()
+            _check_response_headers(response)
+            html, content_hash = _read_body(response, deadline)
+    
+    validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+    return FetchedPage(html, content_hash, False, validators)
+
+def fetch_html(url):
+    """
+    Download a page once through the shared session
+    
+    Args:
+        url (str): URL of the page to fetch
         
-        # First try with trafilatura for text content (better for article content)
-        downloaded = trafilatura.fetch_url(url)
-        text_content = ""
-        if downloaded:
-            text_content = trafilatura.extract(downloaded)
-            if text_content and len(text_content.strip()) > 100:
-                logger.debug("Content extracted using trafilatura")
+    Returns:
+        str: The decoded HTML of the page
+    """
+    return fetch_page(url).html
+
+def _dimension(value):
+    """Parse a width/height attribute, treating non-numeric values (e.g. '100%') as unknown"""
+    return int(value) if value and value.isdigit() else 0
+
+def _scan_page(soup, skip_boilerplate=False):
+    """
+    Walk the parsed page once and collect everything the extractor needs
+    
+    Paragraph counts are accumulated bottom-up during the walk, so finding the
+    div with the most paragraphs takes time linear in the size of the page
+    instead of growing with its nesting depth.
+    
+    Args:
+        soup (BeautifulSoup): The parsed page
+        skip_boilerplate (bool): Leave out script, style, nav, footer and header
+            elements; they are returned so the caller can remove them
         
-        # If trafilatura didn't get good results, use BeautifulSoup
-        if not text_content or len(text_content.strip()) <= 100:
-            # Remove unwanted elements
-            for element in soup.find_all(['script', 'style', 'nav', 'footer', 'header']):
-                element.decompose()
-            
-            # Try to find the main content
-            main_content = None
-            
-            # Look for article tag
-            article = soup.find('article')
-            if article:
-                main_content = article
-            
-            # If article tag not found, try common content div classes
-            if not main_content:
-                for div in soup.find_all('div', class_=['content', 'article', 'post', 'entry', 'main-content']):
-                    if div.text and len(div.text.strip()) > 200:
-                        main_content = div
-                        break
-            
-            # If still not found, look for the div with the most paragraphs
-            if not main_content:
-                max_paragraphs = 0
-                for div in soup.find_all('div'):
-                    paragraphs = div.find_all('p')
-                    if len(paragraphs) > max_paragraphs:
-                        max_paragraphs = len(paragraphs)
-                        main_content = div
-            
-            # Extract text from main content or fallback to all paragraphs
-            if main_content:
-                paragraphs = main_content.find_all('p')
-                text_content = ' '.join([p.get_text().strip() for p in paragraphs])
-            else:
-                # Fallback: get all paragraphs in the document
-                paragraphs = soup.find_all('p')
-                text_content = ' '.join([p.get_text().strip() for p in paragraphs])
-            
-            # Clean up the text content
-            text_content = ' '.join(text_content.split())
-            logger.debug("Content extracted using BeautifulSoup")
+    Returns:
+        PageScan: The first article, content-class divs, densest div, images,
+            og:image meta tag, element position spans and skipped elements
+    """
+    article = None
+    og_image = None
+    content_divs = []
+    images = []  # (position, img tag) in document order
+    spans = {}  # id(div or article) -> (position, position of its last descendant)
+    boilerplate = []
+    densest_div, densest_count, densest_start = None, 0, 0
+    
+    position = 0
+    counts = [0]  # paragraphs found so far inside each open element, innermost last
+    stack = [(child, None) for child in reversed(soup.contents)]
+    while stack:
+        element, start = stack.pop()
         
-        # Try to extract images from the article content first
-        # Ensure main_content is defined before attempting to use it
-        if 'main_content' not in locals() or main_content is None:
-            main_content = None
-            
-        content_area = soup.find('article') or main_content
-        if content_area:
-            # Find all images in the content area
-            for img in content_area.find_all('img', src=True):
-                src = img.get('src')
-                if src and not src.startswith('data:'):
-                    # Convert relative URLs to absolute
-                    img_url = urljoin(url, src)
-                    # Filter out small icons and advertisements
-                    if not re.search(r'(icon|logo|avatar|banner|ad|pixel|tracking)', img_url.lower()):
-                        images.append(img_url)
+        if start is not None:
+            # Leaving the element: its subtree is complete
+            count = counts.pop()
+            if element.name in ('div', 'article'):
+                spans[id(element)] = (start, position)
+            if element.name == 'div' and count and (count > densest_count or (count == densest_count and start < densest_start)):
+                densest_div, densest_count, densest_start = element, count, start
+            counts[-1] += count + (element.name == 'p')
+            continue
         
-        # If no images found in content area, look for og:image meta tags
-        if not images:
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                images.append(urljoin(url, og_image.get('content')))
+        if not isinstance(element, Tag):
+            continue
+        name = element.name
+        if skip_boilerplate and name in BOILERPLATE_TAGS:
+            boilerplate.append(element)
+            continue
         
-        # If still no images, look for large images throughout the document
-        if not images:
-            for img in soup.find_all('img', src=True):
-                src = img.get('src')
-                if src and not src.startswith('data:'):
-                    width = img.get('width')
-                    height = img.get('height')
-                    # Only include reasonably sized images
-                    if (width and height and int(width) > 200 and int(height) > 200) or \
-                       (not width and not height and not re.search(r'(icon|logo|avatar|banner|ad|pixel|tracking)', src.lower())):
-                        img_url = urljoin(url, src)
-                        images.append(img_url)
+        position += 1
+        if name == 'article':
+            article = article or element
+        elif name == 'div':
+            if CONTENT_CLASSES.intersection(element.get('class') or ()):
+                content_divs.append(element)
+        elif name == 'img':
+            if element.has_attr('src'):
+                images.append((position, element))
+        elif name == 'meta':
+            if og_image is None and element.get('property') == 'og:image':
+                og_image = element
         
-        # Limit to top 3 images
-        images = images[:3]
-        logger.debug(f"Extracted {len(images)} images from URL")
+        counts.append(0)
+        stack.append((element, position))
+        stack.extend((child, None) for child in reversed(element.contents))
+    
+    return PageScan(article, content_divs, densest_div, images, og_image, spans, boilerplate)
+
+def extract_content_from_html(html, url=''):
+    """
+    Extract the main content and images from an already downloaded page.
+    Uses trafilatura first, then falls back to BeautifulSoup if needed.
+    
+    Args:
+        html (str): HTML of the page
+        url (str): URL the page was fetched from, used to resolve relative links (optional)
         
-        return (text_content, images)
+    Returns:
+        tuple: (Extracted article text content, List of image URLs)
+    """
+    # Parse with BeautifulSoup for image extraction
+    soup = BeautifulSoup(html, HTML_PARSER)
+    main_content = None
+    
+    # First try with trafilatura for text content (better for article content)
+    text_content = trafilatura.extract(html, url=url or None) or ""
+    use_fallback = len(text_content.strip()) <= 100
+    if not use_fallback:
+        logger.debug("Content extracted using trafilatura")
+    
+    # One walk over the page finds the content candidates and images
+    page = _scan_page(soup, skip_boilerplate=use_fallback)
+    
+    # If trafilatura didn't get good results, use BeautifulSoup
+    if use_fallback:
+        # Remove unwanted elements
+        for element in page.boilerplate:
+            element.decompose()
+        
+        # Look for article tag, then common content div classes, then the div with the most paragraphs
+        main_content = page.article
+        if not main_content:
+            for div in page.content_divs:
+                if len(div.get_text().strip()) > 200:
+                    main_content = div
+                    break
+        if not main_content:
+            main_content = page.densest_div
+        
+        # Extract text from main content or fallback to all paragraphs
+        paragraphs = (main_content or soup).find_all('p')
+        text_content = ' '.join([p.get_text().strip() for p in paragraphs])
+        
+        # Clean up the text content
+        text_content = ' '.join(text_content.split())
+        logger.debug("Content extracted using BeautifulSoup")
+    
+    images = []
+    
+    # Try to extract images from the article content first
+    content_area = page.article or main_content
+    if content_area:
+        start, end = page.spans[id(content_area)]
+        for position, img in page.images:
+            src = img.get('src')
+            if start < position <= end and src and not src.startswith('data:'):
+                # Convert relative URLs to absolute
+                img_url = urljoin(url, src)
+                # Filter out small icons and advertisements
+                if not IMAGE_FILTER.search(img_url):
+                    images.append(img_url)
+    
+    # If no images found in content area, look for og:image meta tags
+    if not images and page.og_image and page.og_image.get('content'):
+        images.append(urljoin(url, page.og_image.get('content')))
+    
+    # If still no images, look for large images throughout the document
+    if not images:
+        for position, img in page.images:
+            src = img.get('src')
+            if src and not src.startswith('data:'):
+                width = img.get('width')
+                height = img.get('height')
+                # Only include reasonably sized images
+                if (width and height and _dimension(width) > 200 and _dimension(height) > 200) or \
+                   (not width and not height and not IMAGE_FILTER.search(src)):
+                    images.append(urljoin(url, src))
+    
+    # Limit to top 3 images
+    images = images[:3]
+    logger.debug(f"Extracted {len(images)} images from URL")
+    
+    return (text_content, images)
+
+def extract_article_content(url):
+    """
+    Extract the main content from a given URL.
+    Uses trafilatura first, then falls back to BeautifulSoup if needed.
+    
+    Args:
+        url (str): URL of the article to extract
+        
+    Returns:
+        tuple: (Extracted article text content, List of image URLs)
+    """
+    try:
+        # Get the page content (single download shared by every extraction step)
+        html = fetch_html(url)
+        return extract_content_from_html(html, url)
     
     except Exception as e:
         logger.error(f"Error extracting content from URL {url}: {str(e)}")
@@ -1,20 +1,127 @@
-import spacy
+import os
 import numpy as np
 import re
-from collections import Counter
+import threading
+import unicodedata
+import multiprocessing
+from collections import Counter, namedtuple
+from functools import partial
 import logging
-
-# Load spaCy language model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    nlp.add_pipe("sentencizer")
-except OSError:
-    # If model not installed, use a basic English model
-    nlp = spacy.blank("en")
-    nlp.add_pipe("sentencizer")
+from utils.lexicon import STOP_WORDS, NUMBER_WORDS, ABBREVIATIONS
+from utils.pools import new_process_pool
 
 logger = logging.getLogger(__name__)
 
+SPACY_MODEL = "en_core_web_sm"
+
+# Pipeline profiles: the model components each profile leaves out. Extractive
+# scoring only reads sentence boundaries and the lexical is_stop/is_punct flags,
+# so the lean profile keeps just the tokenizer plus a rule-based sentencizer.
+PIPELINE_PROFILES = {
+    'lean': ['tok2vec', 'tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'ner'],
+    'full': [],
+}
+
+DEFAULT_PIPELINE_PROFILE = os.environ.get('SUMMARIZER_PIPELINE', 'lean')
+
+# Tokenization backend: 'spacy', or 'regex' for pre-compiled regexes and frozen copies
+# of spaCy's English word lists (spaCy is then never imported)
+SUMMARIZER_BACKENDS = ('spacy', 'regex')
+SUMMARIZER_BACKEND = os.environ.get('SUMMARIZER_BACKEND', 'spacy')
+if SUMMARIZER_BACKEND not in SUMMARIZER_BACKENDS:
+    raise ValueError(f"Unknown summarizer backend: {SUMMARIZER_BACKEND}")
+
+# Regex backend, following the rules of spaCy's English tokenizer and sentencizer:
+# a sentence ends at terminal punctuation (with any closing quotes or brackets)
+# before whitespace, except after an ellipsis, an initial like "J." or an
+# abbreviation, or at a period joining a lowercase and an uppercase letter
+REGEX_SENTENCE_END = re.compile(r'(?:[!?]+|(?<!\.)(?<!\b[A-Z])\.(?!\.))["\'\u201d\u2019)\]]*(?=\s|\Z)|(?<=[a-z])\.(?=[A-Z])')
+REGEX_TOKEN = re.compile(
+    r"(?:https?://|www\.)[^\s<>\"]*[^\s<>\".,;:!?'()\[\]]"  # URLs
+    r"|\d+(?:[.,]\d+)+"  # numbers with separators
+    r"|\w+(?=n['\u2019]t\b)|n['\u2019]t\b|['\u2019](?:s|d|m|ll|re|ve)\b"  # contractions
+    r"|\w+(?:\.(?![A-Z])\w+)*"  # words, including dotted ones like "e.g"
+    r"|[^\w\s]"
+)
+# Whitespace that spaCy keeps as a token of its own (anything but a single space)
+REGEX_SPACE_TOKEN = re.compile(r'\s{2,}|[^\S ]')
+
+# Sentence scoring methods: word frequency (the original scorer), TF-IDF centroid similarity and TextRank
+SCORING_METHODS = ('frequency', 'tfidf', 'textrank')
+DEFAULT_SCORING_METHOD = os.environ.get('SUMMARIZER_METHOD', 'frequency')
+
+# TextRank damping factor and convergence settings
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 100
+TEXTRANK_TOLERANCE = 1e-6
+
+# Texts longer than this are summarized section by section (map) and then as a whole (reduce)
+LONG_DOCUMENT_CHARS = int(os.environ.get('SUMMARIZER_LONG_DOCUMENT_CHARS', 200000))
+
+# Target size of each section in long-document mode
+SECTION_CHARS = int(os.environ.get('SUMMARIZER_SECTION_CHARS', 50000))
+
+# Upper bound on the length of a long-document summary, in sentences
+LONG_SUMMARY_MAX_SENTENCES = int(os.environ.get('SUMMARIZER_LONG_MAX_SENTENCES', 30))
+
+# Worker processes that summarize sections in parallel (gunicorn.conf.py divides the CPUs between its workers)
+SUMMARIZER_WORKERS = int(os.environ.get('SUMMARIZER_WORKERS', os.cpu_count() or 1))
+
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+# Tokens of a run of sentences: sentence index, term key and word flags per token.
+# The regex backend's term keys index into its vocabulary (None for spaCy).
+TokenTable = namedtuple('TokenTable', ['sentence_ids', 'terms', 'is_content', 'is_term', 'num_sentences', 'vocabulary'])
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def load_pipeline(profile=DEFAULT_PIPELINE_PROFILE):
+    """
+    Load the spaCy pipeline used for summarization
+    
+    Args:
+        profile (str): Pipeline profile name, one of PIPELINE_PROFILES (default: 'lean')
+        
+    Returns:
+        spacy.language.Language: The loaded pipeline
+    """
+    if profile not in PIPELINE_PROFILES:
+        raise ValueError(f"Unknown summarizer pipeline profile: {profile}")
+    
+    import spacy
+    
+    try:
+        pipeline = spacy.load(SPACY_MODEL, exclude=PIPELINE_PROFILES[profile])
+    except OSError:
+        # If model not installed, use a basic English model
+        pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    
+    logger.info(f"Loaded summarizer pipeline '{profile}' with components: {', '.join(pipeline.pipe_names)}")
+    return pipeline
+
+def get_pipeline_info():
+    """
+    Describe the active summarization pipeline
+    
+    Returns:
+        dict: Backend, profile name, model name and active component names
+    """
+    if nlp is None:
+        return {'backend': SUMMARIZER_BACKEND, 'profile': None, 'model': None, 'components': []}
+    return {
+        'backend': SUMMARIZER_BACKEND,
+        'profile': pipeline_profile,
+        'model': f"{nlp.meta.get('lang')}_{nlp.meta.get('name')}",
+        'components': list(nlp.pipe_names),
+    }
+
+# Load spaCy language model (the regex backend does not need one)
+pipeline_profile = DEFAULT_PIPELINE_PROFILE
+nlp = load_pipeline(pipeline_profile) if SUMMARIZER_BACKEND == 'spacy' else None
+
 def preprocess_text(text):
     """
     Preprocess text by removing special characters, numbers, and extra whitespace
@@ -40,119 +147,692 @@ def preprocess_text(text):
     
     return text
 
-def calculate_word_frequencies(text):
+def count_words(text):
     """
-    Calculate word frequencies from the text after removing stopwords
+    Count the words of the text after removing stopwords and punctuation
     
     Args:
         text (str): Input text
         
     Returns:
-        dict: Word frequencies dictionary
+        Counter: Raw word counts
     """
-    # Process text with spaCy
-    doc = nlp(text)
+    if nlp is None:
+        return Counter(word for word in REGEX_TOKEN.findall(text) if word.lower() not in STOP_WORDS and not _is_punct(word))
     
-    # Filter out stopwords and punctuation
-    words = [token.text for token in doc if not token.is_stop and not token.is_punct]
+    # Only the tokenizer is needed: stop word and punctuation flags are lexical
+    doc = nlp.make_doc(text)
     
-    # Calculate word frequencies
-    word_freq = Counter(words)
+    # Filter out stopwords and punctuation
+    return Counter(token.text for token in doc if not token.is_stop and not token.is_punct)
+
+def _is_punct(token):
+    """Regex backend: whether a token is punctuation, like spaCy's is_punct"""
+    return all(unicodedata.category(char).startswith('P') for char in token)
+
+def _like_num(token):
+    """Regex backend: whether a lowercase token is a number, like spaCy's like_num"""
+    if token.replace(',', '').replace('.', '').isdigit() or token in NUMBER_WORDS:
+        return True
+    return token.endswith(('st', 'nd', 'rd', 'th')) and token[:-2].isdigit()
+
+def _sentences(text):
+    """Sentence spans of the text, or sentence texts with the regex backend"""
+    if nlp is None:
+        return split_sentences(text)
+    return list(nlp(text).sents)
+
+def _sentence_text(sentence):
+    return sentence if isinstance(sentence, str) else sentence.text.strip()
+
+def split_sentences(text):
+    """
+    Split text into sentences with the configured backend
     
-    # Normalize frequencies
+    Args:
+        text (str): Input text
+        
+    Returns:
+        list: Sentence texts without surrounding whitespace
+    """
+    if nlp is None:
+        sentences = []
+        start = 0
+        for match in REGEX_SENTENCE_END.finditer(text):
+            # Abbreviations are at most a few characters long
+            word = text[max(start, match.start() - 10):match.start() + 1].split()
+            if word and word[-1].lstrip('(["\'') in ABBREVIATIONS:
+                continue
+            sentences.append(text[start:match.end()].strip())
+            start = match.end()
+        sentences.append(text[start:].strip())
+        return [sentence for sentence in sentences if sentence]
+    return [sent.text.strip() for sent in nlp(text).sents]
+
+def _normalize_frequencies(word_freq):
+    """Scale word counts in place so the most frequent word has frequency 1"""
     max_freq = max(word_freq.values()) if word_freq else 1
     for word in word_freq:
         word_freq[word] = word_freq[word] / max_freq
-    
     return word_freq
 
+def calculate_word_frequencies(text):
+    """
+    Calculate word frequencies from the text after removing stopwords
+    
+    Args:
+        text (str): Input text
+        
+    Returns:
+        dict: Word frequencies dictionary
+    """
+    # Calculate and normalize word frequencies
+    return _normalize_frequencies(count_words(text))
+
+def _content_bounds(span):
+    """
+    Get the token bounds of a sentence span without leading/trailing whitespace tokens
+    
+    Args:
+        span (spacy.tokens.Span): Sentence span
+        
+    Returns:
+        tuple: (start, end) token indices into the parent document
+    """
+    doc = span.doc
+    start, end = span.start, span.end
+    while start < end and doc[start].is_space:
+        start += 1
+    while end > start and doc[end - 1].is_space:
+        end -= 1
+    return start, end
+
 def score_sentences(sentences, word_freq):
     """
     Score sentences based on word frequencies
     
+    All sentences are scored at once from the tokens of their parent document,
+    so the pipeline is never re-run per sentence.
+    
     Args:
-        sentences (list): List of sentences
+        sentences (list): List of sentence spans from a single spaCy Doc, or sentence texts
         word_freq (dict): Word frequencies
         
     Returns:
         dict: Sentence scores
     """
+    if not sentences:
+        return {}
+    if isinstance(sentences[0], str):
+        return _score_sentences_regex(sentences, word_freq)
+    
+    doc = sentences[0].doc
+    
+    # Per-token frequency weights and content-word flags for the whole document
+    weights = np.fromiter((word_freq.get(token.lower_, 0.0) for token in doc), dtype=np.float64, count=len(doc))
+    is_content = np.fromiter((not token.is_stop and not token.is_punct for token in doc), dtype=np.int64, count=len(doc))
+    
+    # Sum each sentence's weights over the flat token array; bincount adds them in
+    # token order, exactly like a running sum, using memory linear in the token count
+    starts = np.array([sent.start for sent in sentences], dtype=np.int64)
+    lengths = np.array([len(sent) for sent in sentences], dtype=np.int64)
+    sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+    token_ids = np.arange(len(sentence_ids)) - np.repeat(np.cumsum(lengths) - lengths - starts, lengths)
+    scores = np.bincount(sentence_ids, weights=weights[token_ids], minlength=len(sentences))
+    
+    # Word counts exclude the whitespace tokens that the stripped sentence text drops
+    content_totals = np.concatenate(([0], np.cumsum(is_content)))
+    bounds = np.array([_content_bounds(sent) for sent in sentences], dtype=np.int64)
+    word_counts = content_totals[bounds[:, 1]] - content_totals[bounds[:, 0]]
+    
+    # Skip very short sentences and normalize by sentence length to prevent bias toward longer sentences
     sentence_scores = {}
+    for i in np.flatnonzero(word_counts >= 3):
+        sentence_scores[int(i)] = float(scores[i]) / max(1, int(word_counts[i]))
+    
+    return sentence_scores
+
+def _score_sentences_regex(sentences, word_freq):
+    """Frequency scores of sentence texts tokenized by the regex backend (see score_sentences)"""
+    table = _token_table(sentences)
+    term_weights = np.fromiter((word_freq.get(word, 0.0) for word in table.vocabulary), dtype=np.float64, count=len(table.vocabulary))
+    scores = np.bincount(table.sentence_ids, weights=term_weights[table.terms], minlength=table.num_sentences)
+    word_counts = np.bincount(table.sentence_ids[table.is_content], minlength=table.num_sentences)
+    
+    # Like spaCy's, the frequency scorer counts whitespace tokens inside a sentence as words
+    word_counts += np.fromiter((len(REGEX_SPACE_TOKEN.findall(sentence)) for sentence in sentences), dtype=np.int64, count=len(sentences))
+    return {int(i): float(scores[i]) / int(word_counts[i]) for i in np.flatnonzero(word_counts >= 3)}
+
+def _token_table(sentences):
+    """
+    Read the token attributes of sentences
     
-    for i, sentence in enumerate(sentences):
-        # Process sentence with spaCy
-        doc = nlp(sentence)
+    spaCy attributes are read in one call with Doc.to_array, so no Python code
+    runs per token; sentence texts are tokenized with the regex backend.
+    
+    Args:
+        sentences (list): Contiguous sentence spans from a single spaCy Doc, or sentence texts
         
-        # Filter out stopwords and count words
-        word_count = len([token for token in doc if not token.is_stop and not token.is_punct])
+    Returns:
+        TokenTable: Sentence index, term key and word flags of every token
+    """
+    if isinstance(sentences[0], str):
+        return _regex_token_table(sentences)
+    
+    from spacy.attrs import LOWER, IS_STOP, IS_PUNCT, IS_SPACE, LIKE_NUM
+    
+    sentence_spans = sentences
+    doc = sentence_spans[0].doc
+    attrs = doc.to_array([LOWER, IS_STOP, IS_PUNCT, IS_SPACE, LIKE_NUM])[sentence_spans[0].start:sentence_spans[-1].end]
+    lengths = np.array([len(sent) for sent in sentence_spans], dtype=np.int64)
+    sentence_ids = np.repeat(np.arange(len(sentence_spans)), lengths)
+    is_content = (attrs[:, 1] == 0) & (attrs[:, 2] == 0) & (attrs[:, 3] == 0)
+    return TokenTable(sentence_ids, attrs[:, 0], is_content, is_content & (attrs[:, 4] == 0), len(sentence_spans), None)
+
+def _regex_token_table(sentences):
+    """
+    Tokenize sentence texts with the regex backend
+    
+    Word flags are computed once per distinct word, not per token.
+    
+    Args:
+        sentences (list): Sentence texts
         
-        # Skip very short sentences
-        if word_count < 3:
-            continue
+    Returns:
+        TokenTable: Token table whose term keys index into its vocabulary of lowercase words
+    """
+    tokens = {}
+    terms = []
+    lengths = []
+    for sentence in sentences:
+        sentence_tokens = REGEX_TOKEN.findall(sentence)
+        terms.extend(tokens.setdefault(token, len(tokens)) for token in sentence_tokens)
+        lengths.append(len(sentence_tokens))
+    
+    # Terms are case-insensitive: map every distinct token to its lowercase form
+    vocabulary = {}
+    lowercase = np.fromiter((vocabulary.setdefault(token.lower(), len(vocabulary)) for token in tokens), dtype=np.int64, count=len(tokens))
+    words = list(vocabulary)
+    is_content_word = np.fromiter((word not in STOP_WORDS and not _is_punct(word) for word in words), dtype=bool, count=len(words))
+    is_number = np.fromiter((_like_num(word) for word in words), dtype=bool, count=len(words))
+    
+    terms = lowercase[np.array(terms, dtype=np.int64)]
+    sentence_ids = np.repeat(np.arange(len(sentences)), lengths)
+    is_content = is_content_word[terms]
+    return TokenTable(sentence_ids, terms, is_content, is_content & ~is_number[terms], len(sentences), words)
+
+def _tfidf_vectors(table):
+    """
+    Build the sparse TF-IDF sentence-term matrix from a token table
+    
+    Numbers, stop words, punctuation and whitespace are left out.
+    
+    Args:
+        table (TokenTable): Tokens of the sentences
         
-        # Calculate score based on word frequencies
-        score = 0
-        for token in doc:
-            if token.text.lower() in word_freq:
-                score += word_freq[token.text.lower()]
+    Returns:
+        tuple: (rows, terms, weights) of the L2-normalized matrix in coordinate
+            form, the number of terms, and the content word count of each sentence
+    """
+    num_sentences = table.num_sentences
+    word_counts = np.bincount(table.sentence_ids[table.is_content], minlength=num_sentences)
+    
+    vocabulary, term_ids = np.unique(table.terms[table.is_term], return_inverse=True)
+    num_terms = len(vocabulary)
+    if not num_terms:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(0), 0, word_counts
+    
+    # One entry per (sentence, term) pair with its count in the sentence
+    pairs, counts = np.unique(table.sentence_ids[table.is_term] * num_terms + term_ids.ravel(), return_counts=True)
+    rows, terms = np.divmod(pairs, num_terms)
+    
+    # Sublinear term frequency times smoothed inverse sentence frequency
+    sentence_freq = np.bincount(terms, minlength=num_terms)
+    idf = np.log((1 + num_sentences) / (1 + sentence_freq)) + 1
+    weights = (1 + np.log(counts)) * idf[terms]
+    
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=num_sentences))
+    weights = weights / norms[rows]
+    return rows, terms, weights, num_terms, word_counts
+
+def _dense_vectors(rows, terms, weights, num_terms, num_sentences):
+    """
+    Lay the normalized sentence vectors out densely over the terms shared by two or more sentences
+    
+    Terms that occur in a single sentence never contribute to a similarity, so
+    dropping them keeps the matrix small without changing any dot product.
+    
+    Returns:
+        numpy.ndarray: (sentence, shared term) matrix
+    """
+    shared = np.bincount(terms, minlength=num_terms) >= 2
+    columns = np.cumsum(shared) - 1
+    keep = shared[terms]
+    vectors = np.zeros((num_sentences, int(shared.sum())), dtype=np.float32)
+    vectors[rows[keep], columns[terms[keep]]] = weights[keep]
+    return vectors
+
+def score_sentences_tfidf(sentence_spans):
+    """
+    Score sentences by the cosine similarity of their TF-IDF vector to the document centroid
+    
+    Args:
+        sentence_spans (list): Contiguous sentence spans from a single spaCy Doc, or sentence texts
         
-        # Normalize by sentence length to prevent bias toward longer sentences
-        sentence_scores[i] = score / max(1, word_count)
+    Returns:
+        dict: Sentence scores (sentences with fewer than 3 words are skipped)
+    """
+    if not sentence_spans:
+        return {}
+    rows, terms, weights, num_terms, word_counts = _tfidf_vectors(_token_table(sentence_spans))
     
-    return sentence_scores
+    centroid = np.bincount(terms, weights=weights, minlength=num_terms)
+    centroid_norm = np.sqrt(np.dot(centroid, centroid)) or 1.0
+    scores = np.bincount(rows, weights=weights * centroid[terms], minlength=len(sentence_spans)) / centroid_norm
+    
+    return {int(i): float(scores[i]) for i in np.flatnonzero(word_counts >= 3)}
 
-def summarize_text(text, summary_percentage=0.3, min_sentences=3, max_sentences=10):
+def score_sentences_textrank(sentence_spans):
     """
-    Summarize the given text using extractive summarization
+    Score sentences with TextRank over their TF-IDF cosine similarity graph
     
     Args:
-        text (str): The text to summarize
+        sentence_spans (list): Contiguous sentence spans from a single spaCy Doc, or sentence texts
+        
+    Returns:
+        dict: Sentence scores (sentences with fewer than 3 words are skipped)
+    """
+    if not sentence_spans:
+        return {}
+    num_sentences = len(sentence_spans)
+    rows, terms, weights, num_terms, word_counts = _tfidf_vectors(_token_table(sentence_spans))
+    
+    # The similarity graph is V V^T without its diagonal, for the sentence-term matrix V.
+    # Multiplying through the sparse V instead of building the sentences x sentences
+    # matrix keeps every step linear in the number of (sentence, term) entries.
+    self_similarity = np.bincount(rows, weights=weights ** 2, minlength=num_sentences)
+    
+    def similarity_times(x):
+        term_sums = np.bincount(terms, weights=weights * x[rows], minlength=num_terms)
+        return np.bincount(rows, weights=weights * term_sums[terms], minlength=num_sentences) - self_similarity * x
+    
+    out_weight = similarity_times(np.ones(num_sentences))
+    out_weight = np.where(out_weight > 1e-12, out_weight, np.inf)
+    
+    # Power iteration on the damped random walk (the graph is symmetric, so the
+    # transposed transition matrix is the similarity scaled by each source's out weight)
+    rank = np.full(num_sentences, 1.0 / num_sentences)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / num_sentences + TEXTRANK_DAMPING * similarity_times(rank / out_weight)
+        converged = np.abs(updated - rank).sum() < TEXTRANK_TOLERANCE
+        rank = updated
+        if converged:
+            break
+    
+    return {int(i): float(rank[i]) for i in np.flatnonzero(word_counts >= 3)}
+
+def _select_diverse(sentence_spans, sentence_scores, num_sentences, redundancy_penalty):
+    """
+    Pick sentences greedily by score minus their similarity to sentences already picked (MMR)
+    
+    Args:
+        sentence_spans (list): Contiguous sentence spans from a single spaCy Doc, or sentence texts
+        sentence_scores (dict): Sentence scores
+        num_sentences (int): Number of sentences to pick
+        redundancy_penalty (float): Weight of the redundancy term, between 0 and 1
+        
+    Returns:
+        list: Indices of the picked sentences
+    """
+    rows, terms, weights, num_terms, word_counts = _tfidf_vectors(_token_table(sentence_spans))
+    vectors = _dense_vectors(rows, terms, weights, num_terms, len(sentence_spans))
+    
+    # Scores are rescaled to [0, 1] so they are comparable with cosine similarities
+    relevance = np.full(len(sentence_spans), -np.inf)
+    indices = np.fromiter(sentence_scores.keys(), dtype=np.int64, count=len(sentence_scores))
+    values = np.fromiter(sentence_scores.values(), dtype=np.float64, count=len(sentence_scores))
+    spread = values.max() - values.min() if len(values) else 0.0
+    relevance[indices] = (values - values.min()) / spread if spread else 1.0
+    
+    picked = []
+    max_similarity = np.zeros(len(sentence_spans))
+    for _ in range(min(num_sentences, len(indices))):
+        gain = (1 - redundancy_penalty) * relevance - redundancy_penalty * max_similarity
+        best = int(np.argmax(gain))
+        picked.append(best)
+        relevance[best] = -np.inf
+        max_similarity = np.maximum(max_similarity, vectors @ vectors[best])
+    return picked
+
+def _top_sentences(sentence_spans, word_freq, num_sentences, method='frequency', redundancy_penalty=0.0):
+    """
+    Pick the highest-scoring sentences
+    
+    Args:
+        sentence_spans (list): Sentence spans from a single spaCy Doc, or sentence texts
+        word_freq (dict): Word frequencies (only used by the 'frequency' method)
+        num_sentences (int): Number of sentences to pick
+        method (str): Scoring method, one of SCORING_METHODS
+        redundancy_penalty (float): Penalize sentences similar to ones already picked (0 disables)
+        
+    Returns:
+        list: The selected sentence texts in their original order
+    """
+    # Score sentences
+    if method == 'tfidf':
+        sentence_scores = score_sentences_tfidf(sentence_spans)
+    elif method == 'textrank':
+        sentence_scores = score_sentences_textrank(sentence_spans)
+    else:
+        sentence_scores = score_sentences(sentence_spans, word_freq)
+    
+    # Get the top-scored sentences
+    if redundancy_penalty and sentence_scores:
+        top_sentence_indices = _select_diverse(sentence_spans, sentence_scores, num_sentences, redundancy_penalty)
+    else:
+        top_sentence_indices = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:num_sentences]
+    
+    # Sort the selected sentences by their original order
+    top_sentence_indices = sorted(top_sentence_indices)
+    
+    return [_sentence_text(sentence_spans[i]) for i in top_sentence_indices]
+
+def _check_method(method, redundancy_penalty):
+    if method not in SCORING_METHODS:
+        raise ValueError(f"Unknown summarization method: {method}")
+    if not 0 <= redundancy_penalty < 1:
+        raise ValueError("redundancy_penalty must be at least 0 and below 1")
+
+def summarize_doc(doc, summary_percentage=0.3, min_sentences=3, max_sentences=10,
+                  method=DEFAULT_SCORING_METHOD, redundancy_penalty=0.0):
+    """
+    Summarize an already processed spaCy Doc using extractive summarization
+    
+    Args:
+        doc (spacy.tokens.Doc): The processed document to summarize
         summary_percentage (float): Percentage of original sentences to include (default: 0.3)
         min_sentences (int): Minimum number of sentences in summary
         max_sentences (int): Maximum number of sentences in summary
+        method (str): Sentence scoring method, one of SCORING_METHODS
+        redundancy_penalty (float): Penalize sentences similar to ones already picked (0 disables)
         
     Returns:
         str: Summarized text
     """
-    try:
-        # Break the text into sentences
-        doc = nlp(text)
-        sentences = [sent.text.strip() for sent in doc.sents]
-        
-        # If text is very short, return as is
-        if len(sentences) <= min_sentences:
-            return text
-        
-        # Preprocess text
+    # Break the text into sentences
+    return _summarize_sentences(doc.text, list(doc.sents), summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
+    
+def _summarize_sentences(text, sentence_spans, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty):
+    """Summarize a text from its sentence spans or sentence texts (see summarize_doc)"""
+    # If text is very short, return as is
+    if len(sentence_spans) <= min_sentences:
+        return text
+    
+    # Word frequencies of the preprocessed text (only the frequency method needs them)
+    word_freq = None
+    if method == 'frequency':
         preprocessed_text = preprocess_text(text)
-        
-        # Calculate word frequencies
         word_freq = calculate_word_frequencies(preprocessed_text)
+    
+    # Determine number of sentences for the summary
+    num_sentences = max(min_sentences, min(max_sentences, int(len(sentence_spans) * summary_percentage)))
+    
+    # Build the summary
+    return ' '.join(_top_sentences(sentence_spans, word_freq, num_sentences, method, redundancy_penalty))
+
+def _get_pool():
+    """Create the shared section summarization process pool on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Workers fork from a server that has loaded this module, so the model is loaded once
+            _pool = new_process_pool(SUMMARIZER_WORKERS, preload=(__name__,))
+        return _pool
+
+def split_sections(text, section_chars=SECTION_CHARS):
+    """
+    Split text into sections of at most section_chars characters
+    
+    Sections break at paragraph boundaries where possible, then at sentence
+    ends, and only cut through a sentence that is longer than a whole section.
+    
+    Args:
+        text (str): The text to split
+        section_chars (int): Maximum section length
         
-        # Score sentences
-        sentence_scores = score_sentences(sentences, word_freq)
+    Returns:
+        list: The sections, in order
+    """
+    def pieces():
+        for paragraph in PARAGRAPH_BREAK.split(text):
+            if len(paragraph) <= section_chars:
+                yield paragraph
+                continue
+            for sentence in SENTENCE_END.split(paragraph):
+                for start in range(0, len(sentence), section_chars):
+                    yield sentence[start:start + section_chars]
+    
+    sections = []
+    current = []
+    size = 0
+    for piece in pieces():
+        if current and size + len(piece) > section_chars:
+            sections.append('\n\n'.join(current))
+            current = []
+            size = 0
+        current.append(piece)
+        size += len(piece) + 2
+    if current:
+        sections.append('\n\n'.join(current))
+    
+    return [section for section in sections if section.strip()]
+
+def _summarize_section(section, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty):
+    """
+    Map step: pick the top sentences of one section (runs in a worker process)
+    
+    Args:
+        section (str): Section text
+        summary_percentage (float): Percentage of the section's sentences to keep
+        min_sentences (int): Minimum number of sentences kept
+        max_sentences (int): Maximum number of sentences kept
+        method (str): Sentence scoring method
+        redundancy_penalty (float): Penalize sentences similar to ones already picked
         
-        # Determine number of sentences for the summary
-        num_sentences = max(min_sentences, min(max_sentences, int(len(sentences) * summary_percentage)))
+    Returns:
+        tuple: (Selected sentences, raw word counts of the section)
+    """
+    word_counts = count_words(preprocess_text(section))
+    sentence_spans = _sentences(section)
+    if len(sentence_spans) <= min_sentences:
+        return [_sentence_text(sent) for sent in sentence_spans], word_counts
+    
+    num_sentences = max(min_sentences, min(max_sentences, int(len(sentence_spans) * summary_percentage)))
+    word_freq = _normalize_frequencies(Counter(word_counts))
+    return _top_sentences(sentence_spans, word_freq, num_sentences, method, redundancy_penalty), word_counts
+
+def _map_sections(sections, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty):
+    """Summarize sections in parallel, or in this process when a pool would not help"""
+    summarize_section = partial(
+        _summarize_section,
+        summary_percentage=summary_percentage, min_sentences=min_sentences, max_sentences=max_sentences,
+        method=method, redundancy_penalty=redundancy_penalty
+    )
+    # Worker processes (e.g. bulk summarization) already run one per CPU, so they never start a nested pool
+    if len(sections) < 2 or SUMMARIZER_WORKERS <= 1 or multiprocessing.parent_process() is not None:
+        return list(map(summarize_section, sections))
+    return list(_get_pool().map(summarize_section, sections))
+
+def summarize_long_text(text, summary_percentage=0.3, min_sentences=3, max_sentences=10,
+                        method=DEFAULT_SCORING_METHOD, redundancy_penalty=0.0,
+                        max_total_sentences=LONG_SUMMARY_MAX_SENTENCES, section_chars=SECTION_CHARS):
+    """
+    Summarize a long document hierarchically (map-reduce)
+    
+    The text is split into sections that are summarized in parallel worker
+    processes, so no Doc ever covers more than one section. The reduce pass
+    then ranks the sections' sentences against word frequencies of the whole
+    document. If the section summaries are themselves too long, they are
+    summarized again section by section first.
+    
+    Args:
+        text (str): The text to summarize
+        summary_percentage (float): Percentage of sentences kept at each level (default: 0.3)
+        min_sentences (int): Minimum number of sentences in summary
+        max_sentences (int): Maximum number of sentences kept per section
+        method (str): Sentence scoring method, one of SCORING_METHODS
+        redundancy_penalty (float): Penalize sentences similar to ones already picked (0 disables)
+        max_total_sentences (int): Maximum number of sentences in the final summary
+        section_chars (int): Target section length in characters
         
-        # Get the top-scored sentences
-        top_sentence_indices = sorted(sentence_scores, key=sentence_scores.get, reverse=True)[:num_sentences]
+    Returns:
+        str: Summarized text
+    """
+    sections = split_sections(text, section_chars)
+    word_counts = Counter()
+    candidates = []
+    for sentences, counts in _map_sections(sections, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty):
+        candidates.extend(sentences)
+        word_counts.update(counts)
+    logger.debug(f"Summarized {len(sections)} sections into {len(candidates)} candidate sentences")
+    
+    # Summarize the section summaries again until they fit in a single reduce pass
+    while sum(len(sentence) + 1 for sentence in candidates) > LONG_DOCUMENT_CHARS:
+        sections = split_sections(' '.join(candidates), section_chars)
+        reduced = [sentence for sentences, counts in _map_sections(sections, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty) for sentence in sentences]
+        if len(reduced) >= len(candidates):
+            break
+        candidates = reduced
+    
+    # Reduce: rank the candidates as whole units against the frequencies of the entire document
+    num_sentences = max(min_sentences, max_sentences, min(max_total_sentences, int(len(candidates) * summary_percentage)))
+    if len(candidates) <= num_sentences:
+        return ' '.join(candidates)
+    
+    if nlp is None:
+        # The regex backend scores the candidate sentences as they are
+        spans = candidates
+    else:
+        joined = ' '.join(candidates)
+        doc = nlp.make_doc(joined)
+        spans = []
+        offset = 0
+        for sentence in candidates:
+            spans.append(doc.char_span(offset, offset + len(sentence), alignment_mode='expand'))
+            offset += len(sentence) + 1
+    
+    return ' '.join(_top_sentences(spans, _normalize_frequencies(word_counts), num_sentences, method, redundancy_penalty))
+
+def _fallback_summary(text, summary_percentage, min_sentences, max_sentences):
+    """
+    Build a simple lead-sentences summary when the sophisticated method fails
+    
+    Args:
+        text (str): The text to summarize
+        summary_percentage (float): Percentage of original sentences to include
+        min_sentences (int): Minimum number of sentences in summary
+        max_sentences (int): Maximum number of sentences in summary
         
-        # Sort the selected sentences by their original order
-        top_sentence_indices = sorted(top_sentence_indices)
+    Returns:
+        str: Summarized text
+    """
+    # Long documents fall back to the lead sentences of their beginning
+    sentences = split_sentences(text[:LONG_DOCUMENT_CHARS])
+    num_sentences = max(min_sentences, min(max_sentences, int(len(sentences) * summary_percentage)))
+    return ' '.join(sentences[:num_sentences])
+
+def sentences_for_full_summary(summary_percentage=0.3, min_sentences=3, max_sentences=10, **options):
+    """
+    Number of sentences from which a document's summary reaches max_sentences
+    
+    Text beyond that point no longer makes the summary longer, so extraction
+    can stop there when only the summary length matters.
+    
+    Args:
+        summary_percentage (float): Percentage of original sentences to include (default: 0.3)
+        min_sentences (int): Minimum number of sentences in summary
+        max_sentences (int): Maximum number of sentences in summary
+        **options: Other summarize_text options, which do not affect the length
         
-        # Build the summary
-        summary = ' '.join([sentences[i] for i in top_sentence_indices])
+    Returns:
+        int: Number of document sentences
+    """
+    if summary_percentage <= 0:
+        return min_sentences
+    return max(min_sentences, int(-(-max_sentences // summary_percentage)))
+
+def summarize_text(text, summary_percentage=0.3, min_sentences=3, max_sentences=10,
+                   method=DEFAULT_SCORING_METHOD, redundancy_penalty=0.0):
+    """
+    Summarize the given text using extractive summarization
+    
+    Texts longer than LONG_DOCUMENT_CHARS are summarized hierarchically with
+    summarize_long_text.
+    
+    Args:
+        text (str): The text to summarize
+        summary_percentage (float): Percentage of original sentences to include (default: 0.3)
+        min_sentences (int): Minimum number of sentences in summary
+        max_sentences (int): Maximum number of sentences in summary
+        method (str): Sentence scoring method: 'frequency' (word frequencies), 'tfidf'
+            (similarity to the document's TF-IDF centroid) or 'textrank'
+        redundancy_penalty (float): Between 0 and 1; penalize sentences similar to
+            ones already picked (default: 0, disabled)
         
-        return summary
+    Returns:
+        str: Summarized text
+    """
+    _check_method(method, redundancy_penalty)
+    
+    try:
+        if len(text) > LONG_DOCUMENT_CHARS:
+            return summarize_long_text(text, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
+        return _summarize_sentences(text, _sentences(text), summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
     
     except Exception as e:
         logger.error(f"Error summarizing text: {str(e)}")
         # Fallback to a simple summary if the sophisticated method fails
-        doc = nlp(text)
-        sentences = [sent.text.strip() for sent in doc.sents]
-        num_sentences = max(min_sentences, min(max_sentences, int(len(sentences) * summary_percentage)))
-        return ' '.join(sentences[:num_sentences])
+        return _fallback_summary(text, summary_percentage, min_sentences, max_sentences)
+
+def summarize_texts(texts, summary_percentage=0.3, min_sentences=3, max_sentences=10,
+                    method=DEFAULT_SCORING_METHOD, redundancy_penalty=0.0, batch_size=32):
+    """
+    Summarize many texts, running them through the pipeline in batches with nlp.pipe
+    
+    With the regex backend every text is simply summarized on its own.
+    
+    Args:
+        texts (list): The texts to summarize
+        summary_percentage (float): Percentage of original sentences to include (default: 0.3)
+        min_sentences (int): Minimum number of sentences in summary
+        max_sentences (int): Maximum number of sentences in summary
+        method (str): Sentence scoring method, one of SCORING_METHODS
+        redundancy_penalty (float): Penalize sentences similar to ones already picked (0 disables)
+        batch_size (int): Number of texts buffered per nlp.pipe batch
+        
+    Yields:
+        str: Summarized text, in the same order as the input
+    """
+    _check_method(method, redundancy_penalty)
+    texts = list(texts)
+    
+    # Long documents are summarized hierarchically instead of going through nlp.pipe
+    docs = None
+    if nlp is not None:
+        docs = nlp.pipe((text for text in texts if len(text) <= LONG_DOCUMENT_CHARS), batch_size=batch_size)
+    for text in texts:
+        try:
+            if len(text) > LONG_DOCUMENT_CHARS:
+                yield summarize_long_text(text, summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
+                continue
+            if docs is None:
+                yield _summarize_sentences(text, split_sentences(text), summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
+                continue
+            yield summarize_doc(next(docs), summary_percentage, min_sentences, max_sentences, method, redundancy_penalty)
+        except Exception as e:
+            logger.error(f"Error summarizing text: {str(e)}")
+            yield _fallback_summary(text, summary_percentage, min_sentences, max_sentences)
 
 def calculate_reading_time(text, words_per_minute=200):
     """
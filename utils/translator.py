@@ -1,5 +1,10 @@
+import os
+import re
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from deep_translator import GoogleTranslator
+from utils.cache import ResultCache, SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,28 @@ LANGUAGE_CODES = {
     'ar': 'Arabic'
 }
 
+# Google Translator has character limits, so longer texts are sent in batches
+MAX_CHARS = 5000
+
+# Sentence boundaries: whitespace following terminal punctuation
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])(\s+)')
+
+# Provider requests in flight at once, shared by every chunk and target language
+TRANSLATION_WORKERS = int(os.environ.get('TRANSLATION_WORKERS', 8))
+_executor = ThreadPoolExecutor(max_workers=TRANSLATION_WORKERS, thread_name_prefix='translate')
+
+# Translation memory: sentence translations shared across requests and restarts
+# (set TRANSLATION_MEMORY_URL to an empty string to keep it in memory only)
+translation_memory = ResultCache(
+    ttl=int(os.environ.get('TRANSLATION_MEMORY_TTL', 30 * 24 * 3600)),
+    max_entries=int(os.environ.get('TRANSLATION_MEMORY_MAX_ENTRIES', 50000)),
+    database_url=os.environ.get('TRANSLATION_MEMORY_URL', 'sqlite:///translation_memory.db'),
+    table_name='translation_memory'
+)
+
+# Identical translations requested at the same time share a single set of provider calls
+translation_flights = SingleFlight()
+
 def get_language_name(code):
     """
     Get the display name for a language code
@@ -29,57 +56,212 @@ def get_language_name(code):
     """
     return LANGUAGE_CODES.get(code, code)
 
+def split_sentences(text):
+    """
+    Split text into sentences, keeping the separators so it can be rebuilt exactly
+    
+    Args:
+        text (str): Text to split
+        
+    Returns:
+        tuple: (List of sentences, list of separators between consecutive sentences)
+    """
+    parts = SENTENCE_BOUNDARY.split(text)
+    return parts[0::2], parts[1::2]
+
+def _memory_key(sentence, target_language):
+    """
+    Build the translation memory key for a sentence
+    
+    Args:
+        sentence (str): Source sentence
+        target_language (str): Target language code
+        
+    Returns:
+        str: Hash of the whitespace-normalized sentence and the target language
+    """
+    normalized = ' '.join(sentence.split())
+    return hashlib.sha256(f"{target_language}\x00{normalized}".encode('utf-8')).hexdigest()
+
+def _make_batches(sentences):
+    """
+    Pack sentences one per line into batches under MAX_CHARS
+    
+    Args:
+        sentences (list): Sentences to translate
+        
+    Returns:
+        list: Lists of sentences, one per provider request
+    """
+    batches = []
+    current_batch = []
+    current_length = 0
+    for sentence in sentences:
+        # If adding this sentence would exceed the limit, start a new batch
+        if current_batch and current_length + len(sentence) + 1 > MAX_CHARS:
+            batches.append(current_batch)
+            current_batch = []
+            current_length = 0
+        current_batch.append(sentence)
+        current_length += len(sentence) + 1
+    if current_batch:
+        batches.append(current_batch)
+    return batches
+
+def _translate_batch(batch, target_language):
+    """
+    Translate one batch of sentences in a single provider round trip
+    
+    Sentences are sent one per line, with any line breaks inside a sentence
+    (common in line-wrapped PDF text) collapsed to spaces first.
+    
+    Args:
+        batch (list): Sentences to translate
+        target_language (str): Target language code
+        
+    Returns:
+        list: Translated sentences, in the same order, or None if the provider
+            did not hand back one line per sentence
+    """
+    translator = GoogleTranslator(source='auto', target=target_language)
+    lines = translator.translate('\n'.join(' '.join(sentence.split()) for sentence in batch)).split('\n')
+    if len(lines) != len(batch):
+        return None
+    return [line.strip() for line in lines]
+
+def _translate_sentence(sentence, target_language):
+    """Translate a single sentence, as a batch of one whose result is always one line"""
+    translator = GoogleTranslator(source='auto', target=target_language)
+    return [' '.join(translator.translate(' '.join(sentence.split())).split())]
+
+def _collect(jobs, fresh, errors):
+    """
+    Gather finished chunk translations
+    
+    Args:
+        jobs (list): (target language, sentences, future) of each submitted chunk
+        fresh (dict): Per language, translations by source sentence; updated in place
+        errors (dict): First error per language; updated in place
+        
+    Returns:
+        list: Jobs submitted to retry, one sentence each, the chunks whose lines
+            did not come back one per sentence
+    """
+    retries = []
+    for target_language, batch, future in jobs:
+        try:
+            lines = future.result()
+        except Exception as e:
+            if target_language not in errors:
+                logger.error(f"Translation error ({target_language}): {str(e)}")
+                errors[target_language] = e
+            continue
+        if lines is None:
+            retries.extend(
+                (target_language, [sentence], _executor.submit(_translate_sentence, sentence, target_language))
+                for sentence in batch
+            )
+        else:
+            fresh[target_language].update(zip(batch, lines))
+    return retries
+
+def _translate_into(text, target_languages):
+    """
+    Translate text into several languages, sending every uncached chunk concurrently
+    
+    Args:
+        text (str): Text to translate
+        target_languages (list): Target language codes
+        
+    Returns:
+        dict: Translated text (or a translation error message) per target language
+    """
+    sentences, separators = split_sentences(text.strip())
+    
+    translations = {}
+    pending = []
+    for target_language in target_languages:
+        # Reuse sentences the memory has already seen
+        cached = [translation_memory.get(_memory_key(sentence, target_language)) for sentence in sentences]
+        translations[target_language] = cached
+        
+        # Queue each distinct unseen sentence once, in chunks under the provider limit
+        missing = list(dict.fromkeys(sentences[i] for i, translation in enumerate(cached) if translation is None))
+        for batch in _make_batches(missing):
+            pending.append((target_language, batch, _executor.submit(_translate_batch, batch, target_language)))
+    
+    # Collect the chunks; chunks whose lines did not come back one per sentence are
+    # retried sentence by sentence, all of those retries running concurrently
+    fresh = {target_language: {} for target_language in target_languages}
+    errors = {}
+    retries = _collect(pending, fresh, errors)
+    if retries:
+        logger.debug(f"Retrying {len(retries)} sentences one by one")
+        _collect(retries, fresh, errors)
+    
+    results = {}
+    for target_language in target_languages:
+        if target_language in errors:
+            # Return original text if translation fails
+            results[target_language] = f"Translation error: {str(errors[target_language])}\n\nOriginal text: {text}"
+            continue
+        
+        for sentence, translation in fresh[target_language].items():
+            translation_memory.set(_memory_key(sentence, target_language), translation)
+        pieces_translated = [
+            translation if translation is not None else fresh[target_language][sentence]
+            for sentence, translation in zip(sentences, translations[target_language])
+        ]
+        logger.debug(f"Translated {len(sentences)} sentences to {target_language}, {len(fresh[target_language])} sent to the provider")
+        
+        # Rebuild the text from the translated pieces and the original separators
+        pieces = [pieces_translated[0]]
+        for separator, translation in zip(separators, pieces_translated[1:]):
+            pieces.append(separator)
+            pieces.append(translation)
+        results[target_language] = ''.join(pieces)
+    
+    return results
+
+def _translate_all(text, target_languages):
+    """Translate text into each target language; English and empty text are returned as is"""
+    results = {code: text for code in target_languages if code == 'en' or not text}
+    to_translate = [code for code in target_languages if code not in results]
+    if to_translate:
+        results.update(_translate_into(text, to_translate))
+    return results
+
 def translate_text(text, target_language='en'):
     """
-    Translate text to the target language using the Google Translator API
+    Translate text to the target language(s) using the Google Translator API
+    
+    Sentences already in the translation memory are reused; only unseen
+    sentences are sent to the provider, in chunks translated concurrently. A
+    call made while the same text is already being translated into the same
+    languages waits for that translation instead of repeating it.
     
     Args:
         text (str): Text to translate
-        target_language (str): Target language code (default: 'en')
+        target_language (str or list): Target language code (default: 'en'), or a
+            list of codes to translate into all of them in one call
         
     Returns:
-        str: Translated text
+        str or dict: Translated text, or a dict of translated text per language
+            when a list of languages is given
     """
+    multiple = isinstance(target_language, (list, tuple, set))
+    target_languages = list(dict.fromkeys(target_language)) if multiple else [target_language]
+    
     try:
-        # Skip translation if already in the target language or if text is too long
-        if target_language == 'en' or not text:
-            return text
-        
-        # Google Translator has character limits, so we need to split the text
-        MAX_CHARS = 5000
+        key = (text, tuple(sorted(target_languages)))
+        results, _ = translation_flights.do(key, _translate_all, text, target_languages)
         
-        if len(text) <= MAX_CHARS:
-            # Translate the entire text if it's within limits
-            translator = GoogleTranslator(source='auto', target=target_language)
-            translated_text = translator.translate(text)
-            return translated_text
-        else:
-            # Split the text into sentences and translate them in batches
-            translator = GoogleTranslator(source='auto', target=target_language)
-            
-            # Split by sentences to maintain context
-            sentences = text.split('. ')
-            
-            translated_parts = []
-            current_batch = ""
-            
-            for sentence in sentences:
-                # If adding this sentence would exceed the limit, translate the current batch
-                if len(current_batch) + len(sentence) + 2 > MAX_CHARS:
-                    if current_batch:
-                        translated_parts.append(translator.translate(current_batch))
-                    current_batch = sentence + ". "
-                else:
-                    current_batch += sentence + ". "
-            
-            # Translate any remaining text
-            if current_batch:
-                translated_parts.append(translator.translate(current_batch))
-            
-            # Join the translated parts
-            return ' '.join(translated_parts)
+        if not multiple:
+            return results[target_language]
+        return {code: results[code] for code in target_languages}
     
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
         # Return original text if translation fails
-        return f"Translation error: {str(e)}\n\nOriginal text: {text}"
+        error_text = f"Translation error: {str(e)}\n\nOriginal text: {text}"
+        return {code: error_text for code in target_languages} if multiple else error_text
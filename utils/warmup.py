@@ -0,0 +1,84 @@
+import os
+import time
+import logging
+from utils.scraper import extract_content_from_html
+from utils.summarizer import summarize_text, calculate_reading_time, get_pipeline_info, SCORING_METHODS
+from utils.pdf_generator import generate_pdf
+
+logger = logging.getLogger(__name__)
+
+# Built-in document run through every stage that does not need the network
+WARMUP_PARAGRAPHS = [
+    "The city council approved a plan on Tuesday to expand public transport across the northern districts. "
+    "The plan adds three bus lines and extends the tram network by twelve kilometres. "
+    "Officials expect the first new routes to open next spring.",
+    "Supporters said the expansion would cut commuting times and reduce traffic in the city centre. "
+    "Critics warned that the budget does not cover the cost of maintaining the new lines. "
+    "The council promised to publish a detailed financing plan before construction begins.",
+    "Local businesses welcomed the decision, saying better connections would bring more customers. "
+    "Residents of the northern districts have asked for improved services for many years. "
+    "A public consultation on the exact routes will run until the end of the month.",
+    "Engineers estimate that construction will take about two years. "
+    "Work on the tram extension is planned to start in the autumn. "
+    "The council will report on progress every quarter.",
+]
+
+# Warm-up state of this process; a forked worker inherits it from the process that warmed up
+_state = {'ready': False, 'pid': None, 'finished_at': None, 'timings_ms': {}, 'error': None}
+
+def warm_up():
+    """
+    Run a small built-in document through extraction, summarization and PDF generation
+    
+    Loads lazily imported modules and fills first-use caches, so the first real
+    requests are not slow. When called before a server forks its workers, every
+    worker starts warm and shares the loaded pages copy-on-write.
+    
+    Returns:
+        dict: Duration of each warm-up step in milliseconds
+    """
+    timings = {}
+    
+    def step(name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+    
+    html = '<html><head><title>Warm-up</title></head><body><article>{}</article></body></html>'.format(
+        ''.join(f"<p>{paragraph}</p>" for paragraph in WARMUP_PARAGRAPHS)
+    )
+    
+    try:
+        text, images = step('extract', extract_content_from_html, html)
+        text = text or '\n\n'.join(WARMUP_PARAGRAPHS)
+        for method in SCORING_METHODS:
+            summary = step(f"summarize_{method}", summarize_text, text, method=method)
+        step('pdf', generate_pdf, 'warm-up', summary, reading_time=calculate_reading_time(summary), source_type='url')
+    except Exception as e:
+        logger.error(f"Error warming up: {str(e)}")
+        _state['error'] = str(e)
+        raise Exception(f"Failed to warm up: {str(e)}")
+    
+    _state.update(ready=True, pid=os.getpid(), finished_at=time.time(), timings_ms=timings, error=None)
+    logger.info(f"Warmed up in {sum(timings.values()):.0f} ms: {timings}")
+    return timings
+
+def readiness():
+    """
+    Report whether this process is warm
+    
+    Returns:
+        dict: Readiness, this process id, the id of the process that ran the
+            warm-up (the parent for a preloaded worker) and the warm-up timings
+    """
+    return {
+        'ready': _state['ready'],
+        'pid': os.getpid(),
+        'warmed_up_in': _state['pid'],
+        'preloaded': _state['pid'] is not None and _state['pid'] != os.getpid(),
+        'finished_at': _state['finished_at'],
+        'timings_ms': _state['timings_ms'],
+        'error': _state['error'],
+        'summarizer': get_pipeline_info(),
+    }
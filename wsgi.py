@@ -0,0 +1,27 @@
+"""
+Production entry point.
+
+    gunicorn -c gunicorn.conf.py
+
+Importing this module loads the app with its NLP model, PDF and extraction
+libraries, then runs a warm-up document through them. With preload_app (see
+gunicorn.conf.py) that happens once in the gunicorn master, and every worker
+is forked warm, sharing those pages copy-on-write instead of loading its own
+copy. /ready reports 200 once the serving process is warm.
+"""
+import gc
+import logging
+from app import app
+from utils.warmup import warm_up
+
+logger = logging.getLogger(__name__)
+
+try:
+    warm_up()
+except Exception as e:
+    # A cold worker still serves requests, it just reports not ready
+    logger.error(f"Error during warm-up: {str(e)}")
+
+# Move everything loaded so far out of the garbage collector's reach; otherwise
+# each collection in a worker touches every object and un-shares its page
+gc.freeze()